@@ -1,17 +1,43 @@
 """Simple CLI for running reports and queries."""
 import argparse
 import sys
-from src.utils.report_generator import print_summary_report
-from src.services import DatabaseService
+
+
+def _run_report(args):
+    """Run the report command (imports deferred until dispatch)."""
+    from src.utils.report_generator import print_summary_report
+
+    if args.type == "summary":
+        print_summary_report()
+    else:
+        print(f"Report type '{args.type}' not yet implemented")
+
+
+def _run_query(args):
+    """Run the query command (imports deferred until dispatch)."""
+    from src.services import DatabaseService
+
+    db_service = DatabaseService()
+    status = None if args.type == "all" else args.type
+
+    # Stream results so large tables print as rows arrive instead of
+    # materializing the whole list first.
+    print()
+    count = 0
+    for sub in db_service.iter_submissions(status=status):
+        print(f"  - {sub.applicant_name} ({sub.applicant_email}) - Status: {sub.status}")
+        count += 1
+    print(f"Found {count} submissions")
+
 
 def main():
     """Main CLI entry point."""
     parser = argparse.ArgumentParser(
         description="Scholarship Master - CLI for reports and queries"
     )
-    
+
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
-    
+
     # Report command
     report_parser = subparsers.add_parser("report", help="Generate reports")
     report_parser.add_argument(
@@ -19,7 +45,8 @@ def main():
         choices=["summary", "category", "applicants"],
         help="Type of report to generate"
     )
-    
+    report_parser.set_defaults(func=_run_report)
+
     # Query command
     query_parser = subparsers.add_parser("query", help="Query submissions")
     query_parser.add_argument(
@@ -27,33 +54,17 @@ def main():
         choices=["all", "pending", "completed", "error"],
         help="Type of submissions to query"
     )
-    
+    query_parser.set_defaults(func=_run_query)
+
     # Parse arguments
     args = parser.parse_args()
-    
+
     if not args.command:
         parser.print_help()
         return
-    
+
     try:
-        if args.command == "report":
-            if args.type == "summary":
-                print_summary_report()
-            else:
-                print(f"Report type '{args.type}' not yet implemented")
-        
-        elif args.command == "query":
-            db_service = DatabaseService()
-            
-            if args.type == "all":
-                submissions = db_service.list_submissions()
-            else:
-                submissions = db_service.list_submissions(status=args.type)
-            
-            print(f"\nFound {len(submissions)} submissions:")
-            for sub in submissions:
-                print(f"  - {sub.applicant_name} ({sub.applicant_email}) - Status: {sub.status}")
-    
+        args.func(args)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
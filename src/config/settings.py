@@ -1,27 +1,87 @@
 """Application settings and configuration."""
+import functools
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+
+@functools.lru_cache(maxsize=1)
+def _load_env() -> None:
+    """Parse the .env file once, on first settings access."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+def _env(name: str, default: str = "") -> str:
+    _load_env()
+    return os.getenv(name, default)
 
 
 class Settings:
-    """Application settings from environment variables."""
-    
+    """Application settings from environment variables.
+
+    Environment-backed values are resolved lazily on first attribute
+    access so importing this module stays cheap for commands that never
+    touch them.
+    """
+
     # Google Drive
-    GOOGLE_DRIVE_FOLDER_ID = os.getenv("GOOGLE_DRIVE_FOLDER_ID", "")
-    GOOGLE_SERVICE_ACCOUNT_JSON = os.getenv("GOOGLE_SERVICE_ACCOUNT_JSON", "etlscholarship.json")
-    
+    @functools.cached_property
+    def GOOGLE_DRIVE_FOLDER_ID(self):
+        return _env("GOOGLE_DRIVE_FOLDER_ID", "")
+
+    @functools.cached_property
+    def GOOGLE_SERVICE_ACCOUNT_JSON(self):
+        return _env("GOOGLE_SERVICE_ACCOUNT_JSON", "etlscholarship.json")
+
     # OpenAI
-    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-    
+    @functools.cached_property
+    def OPENAI_API_KEY(self):
+        return _env("OPENAI_API_KEY", "")
+
     # Database
-    DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./scholarship_submissions.db")
-    
+    @functools.cached_property
+    def DATABASE_URL(self):
+        return _env("DATABASE_URL", "sqlite:///./scholarship_submissions.db")
+
     # Application
-    LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
-    MAX_RETRIES = int(os.getenv("MAX_RETRIES", "3"))
-    
+    @functools.cached_property
+    def LOG_LEVEL(self):
+        return _env("LOG_LEVEL", "INFO")
+
+    @functools.cached_property
+    def MAX_RETRIES(self):
+        return int(_env("MAX_RETRIES", "3"))
+
+    @functools.cached_property
+    def DB_FLUSH_INTERVAL(self):
+        """Seconds between background JSON-store flushes (0 disables)."""
+        return float(_env("DB_FLUSH_INTERVAL", "0"))
+
+    @functools.cached_property
+    def DRIVE_CONCURRENCY(self):
+        """Worker threads for parallel Google Drive transfers."""
+        return int(_env("DRIVE_CONCURRENCY", "8"))
+
+    @functools.cached_property
+    def DRIVE_CHUNK_SIZE(self):
+        """Bytes per Drive download chunk (fewer round-trips when larger)."""
+        return int(_env("DRIVE_CHUNK_SIZE", str(4 * 1024 * 1024)))
+
+    @functools.cached_property
+    def EXTRACT_MAX_CHARS(self):
+        """Cap on text extracted per document; parsers stop at this length."""
+        return int(_env("EXTRACT_MAX_CHARS", "5000"))
+
+    @functools.cached_property
+    def DRIVE_LISTING_TTL(self):
+        """Seconds a cached folder listing stays valid (0 disables caching)."""
+        return float(_env("DRIVE_LISTING_TTL", "600"))
+
+    @functools.cached_property
+    def OPENAI_CONCURRENCY(self):
+        """Worker threads for parallel OpenAI grading calls."""
+        return int(_env("OPENAI_CONCURRENCY", "8"))
+
     # Document Categories
     DOCUMENT_CATEGORIES = {
         "essay": {"extensions": [".pdf", ".docx", ".txt"], "keywords": ["essay", "personal statement"]},
@@ -59,3 +119,32 @@ class Settings:
 
 
 settings = Settings()
+
+
+@functools.lru_cache(maxsize=1)
+def keyword_category_pairs() -> tuple:
+    """All (keyword, category) pairs, flattened for single-loop scans."""
+    return tuple(
+        (keyword.lower(), category)
+        for category, rules in Settings.DOCUMENT_CATEGORIES.items()
+        for keyword in rules.get("keywords", [])
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def keyword_automaton():
+    """Aho-Corasick automaton over all category keywords.
+
+    Returns None when pyahocorasick is not installed; callers fall back
+    to scanning keyword_category_pairs().
+    """
+    try:
+        import ahocorasick
+    except ImportError:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for keyword, category in keyword_category_pairs():
+        automaton.add_word(keyword, (category, keyword))
+    automaton.make_automaton()
+    return automaton
@@ -1,6 +1,5 @@
 """SQLAlchemy database models."""
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, Boolean, DateTime, ForeignKey, JSON, Text
+from sqlalchemy import Column, Index, Integer, String, Float, Boolean, DateTime, ForeignKey, JSON, Text, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 
@@ -11,14 +10,17 @@ class SubmissionORM(Base):
     """ORM model for submissions."""
     
     __tablename__ = "submissions"
-    
+    __table_args__ = (
+        Index("ix_submissions_status_created", "status", "created_at"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     applicant_name = Column(String, index=True)
     applicant_email = Column(String, index=True)
     submission_folder_id = Column(String, unique=True, index=True)
     status = Column(String, default="pending")  # pending, processing, completed, error
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     error_message = Column(Text, nullable=True)
     
     documents = relationship("DocumentORM", back_populates="submission", cascade="all, delete-orphan")
@@ -38,7 +40,7 @@ class DocumentORM(Base):
     category = Column(String, nullable=True, index=True)
     downloaded_path = Column(String, nullable=True)
     file_size = Column(Integer, default=0)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     processed = Column(Boolean, default=False)
     error_message = Column(Text, nullable=True)
     
@@ -50,7 +52,10 @@ class ScoreORM(Base):
     """ORM model for document scores."""
     
     __tablename__ = "scores"
-    
+    __table_args__ = (
+        Index("ix_scores_submission_category", "submission_id", "category"),
+    )
+
     id = Column(Integer, primary_key=True, index=True)
     document_id = Column(Integer, ForeignKey("documents.id"), index=True)
     submission_id = Column(Integer, ForeignKey("submissions.id"), index=True)
@@ -59,7 +64,7 @@ class ScoreORM(Base):
     max_score = Column(Float, default=100.0)
     criteria_scores = Column(JSON, default={})
     feedback = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     document = relationship("DocumentORM", back_populates="scores")
     submission = relationship("SubmissionORM", back_populates="scores")
@@ -1,7 +1,7 @@
 """Pydantic schemas for data validation."""
 from datetime import datetime
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class DocumentBase(BaseModel):
@@ -15,7 +15,9 @@ class DocumentBase(BaseModel):
 
 class Document(DocumentBase):
     """Document model with metadata."""
-    
+
+    model_config = ConfigDict(frozen=True)
+
     id: Optional[int] = None
     submission_id: int
     downloaded_path: Optional[str] = None
@@ -31,12 +33,14 @@ class ScoreBase(BaseModel):
     category: str
     total_score: float
     max_score: float = 100.0
-    criteria_scores: Dict[str, float] = {}
+    criteria_scores: Dict[str, float] = Field(default_factory=dict)
 
 
 class Score(ScoreBase):
     """Score model with metadata."""
-    
+
+    model_config = ConfigDict(frozen=True)
+
     id: Optional[int] = None
     document_id: int
     feedback: Optional[str] = None
@@ -53,10 +57,12 @@ class SubmissionBase(BaseModel):
 
 class Submission(SubmissionBase):
     """Submission model with documents and scores."""
-    
+
+    model_config = ConfigDict(frozen=True)
+
     id: Optional[int] = None
-    documents: Optional[list[Document]] = []
-    scores: Optional[list[Score]] = []
+    documents: Optional[list[Document]] = Field(default_factory=list)
+    scores: Optional[list[Score]] = Field(default_factory=list)
     status: str = "pending"  # pending, processing, completed, error
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -1,13 +1,60 @@
 """Services for business logic."""
-from .google_drive_service import GoogleDriveService
-from .document_classifier import DocumentClassifier
-from .grading_agent import GradingAgent
-# Use the lightweight JSON-backed DatabaseService for a simpler workflow
-from .simple_database_service import DatabaseService
+import functools
 
 __all__ = [
     "GoogleDriveService",
     "DocumentClassifier",
     "GradingAgent",
     "DatabaseService",
+    "get_db_service",
+    "get_drive_service",
 ]
+
+
+@functools.lru_cache(maxsize=1)
+def get_db_service():
+    """Shared DatabaseService instance.
+
+    Constructing the backend sets up the store (engine and pool for the
+    SQL backends, file load for the JSON store); the workflow and the
+    report generator should reuse one instance rather than pay that per
+    object.
+    """
+    from .simple_database_service import DatabaseService
+
+    return DatabaseService()
+
+
+@functools.lru_cache(maxsize=1)
+def get_drive_service():
+    """Shared GoogleDriveService instance (holds a credentialed client)."""
+    from .google_drive_service import GoogleDriveService
+
+    return GoogleDriveService()
+
+
+def __getattr__(name):
+    """Import services on first access (PEP 562).
+
+    GradingAgent pulls in the openai SDK and GoogleDriveService the
+    googleapiclient stack; resolving them lazily keeps those imports out
+    of commands that never use them (e.g. cli.py report/query).
+    """
+    if name == "GoogleDriveService":
+        from .google_drive_service import GoogleDriveService
+
+        return GoogleDriveService
+    if name == "DocumentClassifier":
+        from .document_classifier import DocumentClassifier
+
+        return DocumentClassifier
+    if name == "GradingAgent":
+        from .grading_agent import GradingAgent
+
+        return GradingAgent
+    if name == "DatabaseService":
+        # Use the lightweight JSON-backed DatabaseService for a simpler workflow
+        from .simple_database_service import DatabaseService
+
+        return DatabaseService
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,12 @@
 """Database service for managing submissions and scores."""
+import functools
 import logging
-from typing import List, Optional
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, event, func, insert, select, update
+from sqlalchemy.orm import sessionmaker, Session, selectinload
 
 from src.config import settings
 from src.models.database import Base, SubmissionORM, DocumentORM, ScoreORM
@@ -10,37 +14,118 @@ from src.models.schemas import Submission, Document, Score
 
 logger = logging.getLogger(__name__)
 
+# Built once so list reads validate whole row batches in pydantic-core
+# instead of constructing each schema object field-by-field in Python.
+_DOCUMENT_LIST_ADAPTER = TypeAdapter(List[Document])
+_SCORE_LIST_ADAPTER = TypeAdapter(List[Score])
+
+# Updatable columns, computed once instead of hasattr per call.
+_DOCUMENT_COLUMNS = frozenset(DocumentORM.__table__.columns.keys())
+
+
+@functools.lru_cache(maxsize=1)
+def _get_engine():
+    """Create the engine once per process and ensure tables exist."""
+    if "sqlite" in settings.DATABASE_URL:
+        engine_kwargs = {"connect_args": {"check_same_thread": False}}
+    else:
+        engine_kwargs = {
+            "pool_size": 10,
+            "max_overflow": 20,
+            "pool_recycle": 3600,
+            "pool_pre_ping": True,
+        }
+    engine = create_engine(settings.DATABASE_URL, **engine_kwargs)
+    if "sqlite" in settings.DATABASE_URL:
+        # WAL avoids an fsync per commit and lets readers run while the
+        # workflow is writing; synchronous=NORMAL is safe under WAL.
+        @event.listens_for(engine, "connect")
+        def _set_sqlite_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA temp_store=MEMORY")
+            cursor.execute("PRAGMA mmap_size=268435456")
+            cursor.close()
+
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+@functools.lru_cache(maxsize=1)
+def _get_sessionmaker():
+    """Create the shared sessionmaker bound to the cached engine.
+
+    expire_on_commit is disabled so attributes (notably freshly assigned
+    primary keys) stay readable after commit without a reload SELECT.
+    """
+    return sessionmaker(
+        autocommit=False, autoflush=False, expire_on_commit=False, bind=_get_engine()
+    )
+
 
 class DatabaseService:
     """Service for database operations."""
-    
+
+    # Keep memoized reads bounded; the whole cache is dropped when full.
+    _READ_CACHE_MAX = 1024
+
     def __init__(self):
         """Initialize database service."""
-        self.engine = create_engine(
-            settings.DATABASE_URL,
-            connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
-        )
-        Base.metadata.create_all(bind=self.engine)
-        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+        self.engine = _get_engine()
+        self.SessionLocal = _get_sessionmaker()
+        self._submission_cache = {}
+        self._document_cache = {}
+
+    def _cache_put(self, cache: dict, key, value) -> None:
+        """Store a memoized read, clearing the cache if it grew too big."""
+        if len(cache) >= self._READ_CACHE_MAX:
+            cache.clear()
+        cache[key] = value
+
+    def _invalidate_submission(self, submission_id: int) -> None:
+        self._submission_cache.pop(submission_id, None)
     
     def get_session(self) -> Session:
         """Get a database session."""
         return self.SessionLocal()
-    
+
+    @contextmanager
+    def session_scope(self):
+        """Provide a transactional scope around a series of operations.
+
+        Batched callers can pass the yielded session to the create methods
+        so many writes share one transaction (and one commit) instead of
+        opening and closing a session per call.
+        """
+        db = self.SessionLocal()
+        try:
+            yield db
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
     # Submission methods
-    def create_submission(self, submission: Submission) -> int:
+    def create_submission(self, submission: Submission, session: Optional[Session] = None) -> int:
         """Create a new submission record."""
+        db_submission = SubmissionORM(
+            applicant_name=submission.applicant_name,
+            applicant_email=submission.applicant_email,
+            submission_folder_id=submission.submission_folder_id,
+            status=submission.status,
+        )
+        if session is not None:
+            session.add(db_submission)
+            session.flush()
+            return db_submission.id
+
         db = self.get_session()
         try:
-            db_submission = SubmissionORM(
-                applicant_name=submission.applicant_name,
-                applicant_email=submission.applicant_email,
-                submission_folder_id=submission.submission_folder_id,
-                status=submission.status,
-            )
             db.add(db_submission)
             db.commit()
-            db.refresh(db_submission)
             logger.info(f"Created submission {db_submission.id} for {submission.applicant_name}")
             return db_submission.id
         except Exception as e:
@@ -50,22 +135,68 @@ class DatabaseService:
         finally:
             db.close()
     
+    def upsert_submission(self, submission: Submission) -> int:
+        """Create a submission or return the existing one's ID.
+
+        Uses INSERT ... ON CONFLICT on the unique submission_folder_id
+        so callers don't need the racy SELECT-then-INSERT dance.
+        """
+        if self.engine.dialect.name == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+            stmt = (
+                sqlite_insert(SubmissionORM)
+                .values(
+                    applicant_name=submission.applicant_name,
+                    applicant_email=submission.applicant_email,
+                    submission_folder_id=submission.submission_folder_id,
+                    status=submission.status,
+                )
+                .on_conflict_do_update(
+                    index_elements=["submission_folder_id"],
+                    set_={"updated_at": datetime.utcnow()},
+                )
+                .returning(SubmissionORM.id)
+            )
+            with self.session_scope() as db:
+                submission_id = db.execute(stmt).scalar_one()
+                self._invalidate_submission(submission_id)
+                return submission_id
+
+        # Other dialects: fall back to lookup-then-create.
+        existing = self.get_submission_by_folder_id(submission.submission_folder_id)
+        if existing:
+            return existing.id
+        return self.create_submission(submission)
+
     def get_submission(self, submission_id: int) -> Optional[Submission]:
         """Get a submission by ID."""
+        cached = self._submission_cache.get(submission_id)
+        if cached is not None:
+            return cached
+
         db = self.get_session()
         try:
-            db_submission = db.query(SubmissionORM).filter(SubmissionORM.id == submission_id).first()
+            db_submission = db.query(SubmissionORM).options(
+                selectinload(SubmissionORM.documents),
+                selectinload(SubmissionORM.scores),
+            ).filter(SubmissionORM.id == submission_id).first()
             if db_submission:
-                return self._orm_to_schema(db_submission)
+                submission = self._orm_to_schema(db_submission)
+                self._cache_put(self._submission_cache, submission_id, submission)
+                return submission
             return None
         finally:
             db.close()
-    
+
     def get_submission_by_folder_id(self, folder_id: str) -> Optional[Submission]:
         """Get a submission by Google Drive folder ID."""
         db = self.get_session()
         try:
-            db_submission = db.query(SubmissionORM).filter(
+            db_submission = db.query(SubmissionORM).options(
+                selectinload(SubmissionORM.documents),
+                selectinload(SubmissionORM.scores),
+            ).filter(
                 SubmissionORM.submission_folder_id == folder_id
             ).first()
             if db_submission:
@@ -78,7 +209,10 @@ class DatabaseService:
         """List all submissions, optionally filtered by status."""
         db = self.get_session()
         try:
-            query = db.query(SubmissionORM)
+            query = db.query(SubmissionORM).options(
+                selectinload(SubmissionORM.documents),
+                selectinload(SubmissionORM.scores),
+            )
             if status:
                 query = query.filter(SubmissionORM.status == status)
             
@@ -86,6 +220,26 @@ class DatabaseService:
             return [self._orm_to_schema(s) for s in db_submissions]
         finally:
             db.close()
+
+    def iter_submissions(self, status: Optional[str] = None) -> Iterator[Submission]:
+        """Stream submissions instead of materializing the full list.
+
+        Rows arrive in batches via yield_per, so memory stays constant
+        and the first result is available before the query finishes.
+        """
+        db = self.get_session()
+        try:
+            query = db.query(SubmissionORM).options(
+                selectinload(SubmissionORM.documents),
+                selectinload(SubmissionORM.scores),
+            )
+            if status:
+                query = query.filter(SubmissionORM.status == status)
+
+            for db_submission in query.yield_per(500):
+                yield self._orm_to_schema(db_submission)
+        finally:
+            db.close()
     
     def update_submission_status(self, submission_id: int, status: str, error_message: Optional[str] = None) -> None:
         """Update submission status."""
@@ -97,6 +251,7 @@ class DatabaseService:
                 if error_message:
                     db_submission.error_message = error_message
                 db.commit()
+                self._invalidate_submission(submission_id)
                 logger.info(f"Updated submission {submission_id} status to {status}")
         except Exception as e:
             db.rollback()
@@ -106,21 +261,26 @@ class DatabaseService:
             db.close()
     
     # Document methods
-    def create_document(self, submission_id: int, document: Document) -> int:
+    def create_document(self, submission_id: int, document: Document, session: Optional[Session] = None) -> int:
         """Create a new document record."""
+        db_document = DocumentORM(
+            submission_id=submission_id,
+            name=document.name,
+            google_drive_id=document.google_drive_id,
+            mime_type=document.mime_type,
+            category=document.category,
+            file_size=document.file_size,
+        )
+        self._invalidate_submission(submission_id)
+        if session is not None:
+            session.add(db_document)
+            session.flush()
+            return db_document.id
+
         db = self.get_session()
         try:
-            db_document = DocumentORM(
-                submission_id=submission_id,
-                name=document.name,
-                google_drive_id=document.google_drive_id,
-                mime_type=document.mime_type,
-                category=document.category,
-                file_size=document.file_size,
-            )
             db.add(db_document)
             db.commit()
-            db.refresh(db_document)
             logger.info(f"Created document {db_document.id} for submission {submission_id}")
             return db_document.id
         except Exception as e:
@@ -130,13 +290,48 @@ class DatabaseService:
         finally:
             db.close()
     
+    def bulk_create_documents(self, submission_id: int, documents: List[Document]) -> List[int]:
+        """Create many document records in a single INSERT."""
+        if not documents:
+            return []
+        rows = [
+            {
+                "submission_id": submission_id,
+                "name": d.name,
+                "google_drive_id": d.google_drive_id,
+                "mime_type": d.mime_type,
+                "category": d.category,
+                "file_size": d.file_size,
+                "processed": d.processed,
+            }
+            for d in documents
+        ]
+        self._invalidate_submission(submission_id)
+        with self.session_scope() as db:
+            # sort_by_parameter_order guarantees returned IDs line up with
+            # rows; callers zip them against the input documents.
+            ids = db.scalars(
+                insert(DocumentORM).returning(
+                    DocumentORM.id, sort_by_parameter_order=True
+                ),
+                rows,
+            ).all()
+            logger.info(f"Created {len(ids)} documents for submission {submission_id}")
+            return list(ids)
+
     def get_document(self, document_id: int) -> Optional[Document]:
         """Get a document by ID."""
+        cached = self._document_cache.get(document_id)
+        if cached is not None:
+            return cached
+
         db = self.get_session()
         try:
             db_document = db.query(DocumentORM).filter(DocumentORM.id == document_id).first()
             if db_document:
-                return self._document_orm_to_schema(db_document)
+                document = self._document_orm_to_schema(db_document)
+                self._cache_put(self._document_cache, document_id, document)
+                return document
             return None
         finally:
             db.close()
@@ -145,22 +340,30 @@ class DatabaseService:
         """List documents for a submission."""
         db = self.get_session()
         try:
-            db_documents = db.query(DocumentORM).filter(DocumentORM.submission_id == submission_id).all()
-            return [self._document_orm_to_schema(d) for d in db_documents]
+            rows = db.execute(
+                select(DocumentORM.__table__).where(DocumentORM.submission_id == submission_id)
+            ).mappings().all()
+            return _DOCUMENT_LIST_ADAPTER.validate_python(rows)
         finally:
             db.close()
     
     def update_document(self, document_id: int, **kwargs) -> None:
-        """Update document fields."""
+        """Update document fields with a single set-based UPDATE."""
+        values = {k: v for k, v in kwargs.items() if k in _DOCUMENT_COLUMNS}
+        if not values:
+            return
+
         db = self.get_session()
         try:
-            db_document = db.query(DocumentORM).filter(DocumentORM.id == document_id).first()
-            if db_document:
-                for key, value in kwargs.items():
-                    if hasattr(db_document, key):
-                        setattr(db_document, key, value)
-                db.commit()
-                logger.info(f"Updated document {document_id}")
+            db.execute(
+                update(DocumentORM).where(DocumentORM.id == document_id).values(**values)
+            )
+            db.commit()
+            self._document_cache.pop(document_id, None)
+            # The parent submission embeds its documents; without reading
+            # the row back we don't know which one, so drop them all.
+            self._submission_cache.clear()
+            logger.info(f"Updated document {document_id}")
         except Exception as e:
             db.rollback()
             logger.error(f"Error updating document: {e}")
@@ -169,22 +372,27 @@ class DatabaseService:
             db.close()
     
     # Score methods
-    def create_score(self, submission_id: int, score: Score) -> int:
+    def create_score(self, submission_id: int, score: Score, session: Optional[Session] = None) -> int:
         """Create a new score record."""
+        db_score = ScoreORM(
+            submission_id=submission_id,
+            document_id=score.document_id,
+            category=score.category,
+            total_score=score.total_score,
+            max_score=score.max_score,
+            criteria_scores=score.criteria_scores,
+            feedback=score.feedback,
+        )
+        self._invalidate_submission(submission_id)
+        if session is not None:
+            session.add(db_score)
+            session.flush()
+            return db_score.id
+
         db = self.get_session()
         try:
-            db_score = ScoreORM(
-                submission_id=submission_id,
-                document_id=score.document_id,
-                category=score.category,
-                total_score=score.total_score,
-                max_score=score.max_score,
-                criteria_scores=score.criteria_scores,
-                feedback=score.feedback,
-            )
             db.add(db_score)
             db.commit()
-            db.refresh(db_score)
             logger.info(f"Created score {db_score.id} for document {score.document_id}")
             return db_score.id
         except Exception as e:
@@ -194,12 +402,41 @@ class DatabaseService:
         finally:
             db.close()
     
+    def bulk_create_scores(self, submission_id: int, scores: List[Score]) -> List[int]:
+        """Create many score records in a single INSERT."""
+        if not scores:
+            return []
+        rows = [
+            {
+                "submission_id": submission_id,
+                "document_id": s.document_id,
+                "category": s.category,
+                "total_score": s.total_score,
+                "max_score": s.max_score,
+                "criteria_scores": s.criteria_scores,
+                "feedback": s.feedback,
+            }
+            for s in scores
+        ]
+        self._invalidate_submission(submission_id)
+        with self.session_scope() as db:
+            ids = db.scalars(
+                insert(ScoreORM).returning(
+                    ScoreORM.id, sort_by_parameter_order=True
+                ),
+                rows,
+            ).all()
+            logger.info(f"Created {len(ids)} scores for submission {submission_id}")
+            return list(ids)
+
     def get_scores(self, document_id: int) -> List[Score]:
         """Get scores for a document."""
         db = self.get_session()
         try:
-            db_scores = db.query(ScoreORM).filter(ScoreORM.document_id == document_id).all()
-            return [self._score_orm_to_schema(s) for s in db_scores]
+            rows = db.execute(
+                select(ScoreORM.__table__).where(ScoreORM.document_id == document_id)
+            ).mappings().all()
+            return self._score_rows_to_schemas(rows)
         finally:
             db.close()
     
@@ -207,12 +444,198 @@ class DatabaseService:
         """Get all scores for a submission."""
         db = self.get_session()
         try:
-            db_scores = db.query(ScoreORM).filter(ScoreORM.submission_id == submission_id).all()
-            return [self._score_orm_to_schema(s) for s in db_scores]
+            rows = db.execute(
+                select(ScoreORM.__table__).where(ScoreORM.submission_id == submission_id)
+            ).mappings().all()
+            return self._score_rows_to_schemas(rows)
         finally:
             db.close()
-    
+
+    def get_scores_for_submissions(self, submission_ids: List[int]) -> Dict[int, List[Score]]:
+        """Get scores for many submissions with one IN query.
+
+        Replaces the per-submission fetch loop (the N+1 pattern) in
+        report paths; every requested id appears in the result, with an
+        empty list when it has no scores.
+        """
+        if not submission_ids:
+            return {}
+        db = self.get_session()
+        try:
+            rows = db.execute(
+                select(ScoreORM.__table__).where(
+                    ScoreORM.submission_id.in_(submission_ids)
+                )
+            ).mappings().all()
+        finally:
+            db.close()
+
+        buckets = {sid: [] for sid in submission_ids}
+        for row in rows:
+            buckets.setdefault(row["submission_id"], []).append(row)
+        return {sid: self._score_rows_to_schemas(rs) for sid, rs in buckets.items()}
+
+    # Aggregate methods
+    def get_submission_stats(self) -> dict:
+        """Summary counters computed server-side.
+
+        Status counts, document count, and score count/avg/min/max come
+        from three aggregate statements with no ORM hydration.
+        """
+        db = self.get_session()
+        try:
+            status_rows = db.execute(
+                select(SubmissionORM.status, func.count())
+                .group_by(SubmissionORM.status)
+            ).all()
+            total_documents = db.execute(
+                select(func.count(DocumentORM.id))
+            ).scalar() or 0
+            score_count, avg_score, high_score, low_score = db.execute(
+                select(
+                    func.count(ScoreORM.id),
+                    func.avg(ScoreORM.total_score),
+                    func.max(ScoreORM.total_score),
+                    func.min(ScoreORM.total_score),
+                )
+            ).one()
+        finally:
+            db.close()
+
+        status_counts = dict(status_rows)
+        return {
+            "total_submissions": sum(status_counts.values()),
+            "completed": status_counts.get("completed", 0),
+            "processing": status_counts.get("processing", 0),
+            "errors": status_counts.get("error", 0),
+            "total_documents": total_documents,
+            "average_score": float(avg_score) if score_count else 0,
+            "high_score": float(high_score) if score_count else 0,
+            "low_score": float(low_score) if score_count else 0,
+        }
+
+    def get_category_stats(self) -> dict:
+        """Per-category score roll-up via one GROUP BY query."""
+        db = self.get_session()
+        try:
+            rows = db.execute(
+                select(
+                    ScoreORM.category,
+                    func.count(ScoreORM.id),
+                    func.sum(ScoreORM.total_score),
+                    func.avg(ScoreORM.total_score),
+                    func.min(ScoreORM.total_score),
+                    func.max(ScoreORM.total_score),
+                ).group_by(ScoreORM.category)
+            ).all()
+        finally:
+            db.close()
+
+        return {
+            category: {
+                "count": count,
+                "total_score": float(total or 0),
+                "avg_score": float(avg or 0),
+                "min_score": float(low or 0),
+                "max_score": float(high or 0),
+            }
+            for category, count, total, avg, low, high in rows
+        }
+
+    def get_top_applicants(self, limit: int = 10) -> List[dict]:
+        """Top applicants by summed score via grouped ORDER BY + LIMIT.
+
+        The database keeps only the top rows; Python never materializes
+        the rest. Grouped subqueries avoid the documents x scores
+        cross-product a direct double join would produce.
+        """
+        db = self.get_session()
+        try:
+            doc_counts = (
+                select(
+                    DocumentORM.submission_id,
+                    func.count(DocumentORM.id).label("document_count"),
+                )
+                .group_by(DocumentORM.submission_id)
+                .subquery()
+            )
+            score_totals = (
+                select(
+                    ScoreORM.submission_id,
+                    func.sum(ScoreORM.total_score).label("total_score"),
+                )
+                .group_by(ScoreORM.submission_id)
+                .subquery()
+            )
+            total_score = func.coalesce(score_totals.c.total_score, 0)
+            rows = db.execute(
+                select(
+                    SubmissionORM.applicant_name,
+                    SubmissionORM.applicant_email,
+                    total_score.label("total_score"),
+                    func.coalesce(doc_counts.c.document_count, 0).label("document_count"),
+                    SubmissionORM.status,
+                )
+                .outerjoin(score_totals, score_totals.c.submission_id == SubmissionORM.id)
+                .outerjoin(doc_counts, doc_counts.c.submission_id == SubmissionORM.id)
+                .order_by(total_score.desc())
+                .limit(limit)
+            ).mappings().all()
+            return [dict(r) for r in rows]
+        finally:
+            db.close()
+
+    def summary(self) -> List[dict]:
+        """Per-submission score roll-up computed server-side.
+
+        One statement with grouped subqueries replaces pulling every
+        score row into Python just to sum and average it.
+        """
+        db = self.get_session()
+        try:
+            doc_counts = (
+                select(
+                    DocumentORM.submission_id,
+                    func.count(DocumentORM.id).label("document_count"),
+                )
+                .group_by(DocumentORM.submission_id)
+                .subquery()
+            )
+            score_stats = (
+                select(
+                    ScoreORM.submission_id,
+                    func.sum(ScoreORM.total_score).label("total_score"),
+                    func.avg(ScoreORM.total_score).label("average_score"),
+                )
+                .group_by(ScoreORM.submission_id)
+                .subquery()
+            )
+            rows = db.execute(
+                select(
+                    SubmissionORM.id,
+                    SubmissionORM.applicant_name,
+                    SubmissionORM.applicant_email,
+                    SubmissionORM.status,
+                    func.coalesce(doc_counts.c.document_count, 0).label("document_count"),
+                    func.coalesce(score_stats.c.total_score, 0.0).label("total_score"),
+                    func.coalesce(score_stats.c.average_score, 0.0).label("average_score"),
+                )
+                .outerjoin(doc_counts, doc_counts.c.submission_id == SubmissionORM.id)
+                .outerjoin(score_stats, score_stats.c.submission_id == SubmissionORM.id)
+            ).mappings().all()
+            return [dict(r) for r in rows]
+        finally:
+            db.close()
+
     # Helper methods
+    def _score_rows_to_schemas(self, rows) -> List[Score]:
+        """Validate a batch of score rows into schemas in one pass."""
+        rows = [
+            dict(r) if r["criteria_scores"] is not None else {**r, "criteria_scores": {}}
+            for r in rows
+        ]
+        return _SCORE_LIST_ADAPTER.validate_python(rows)
+
     def _orm_to_schema(self, db_submission: SubmissionORM) -> Submission:
         """Convert ORM submission to schema."""
         return Submission(
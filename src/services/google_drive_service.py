@@ -1,13 +1,22 @@
 """Google Drive API service for accessing submissions."""
+import atexit
+import functools
 import io
 import os
 import logging
+import shelve
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Optional
+import httplib2
 from google.auth.transport.requests import Request
 from google.oauth2.service_account import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaIoBaseDownload
 
 from src.config import settings
@@ -17,41 +26,120 @@ logger = logging.getLogger(__name__)
 SCOPES = ["https://www.googleapis.com/auth/drive"]
 
 
+@functools.lru_cache(maxsize=1)
+def _get_credentials():
+    """Load Drive credentials once per process.
+
+    Every GoogleDriveService instance (and worker thread) shares the
+    same credentials object instead of re-reading the service account
+    JSON or re-running the OAuth flow.
+    """
+    if os.path.exists(settings.GOOGLE_SERVICE_ACCOUNT_JSON):
+        return Credentials.from_service_account_file(
+            settings.GOOGLE_SERVICE_ACCOUNT_JSON,
+            scopes=SCOPES
+        )
+
+    logger.warning("Service account JSON not found. Using OAuth flow.")
+    flow = InstalledAppFlow.from_client_secrets_file("credentials.json", SCOPES)
+    return flow.run_local_server(port=0)
+
+
+def _build_service(credentials):
+    """Build a Drive service over a connection-reusing transport.
+
+    A dedicated httplib2.Http keeps its TLS connection alive between
+    calls (instead of a handshake per request) and caches cacheable
+    responses in .http_cache. AuthorizedHttp objects are not
+    thread-safe, so each worker thread builds its own.
+    """
+    http = AuthorizedHttp(
+        credentials,
+        http=httplib2.Http(cache=httplib2.FileCache(".http_cache"), timeout=30),
+    )
+    # static_discovery skips fetching/parsing the discovery document;
+    # cache_discovery silences the file-cache path.
+    return build(
+        "drive", "v3",
+        http=http,
+        cache_discovery=False,
+        static_discovery=True,
+    )
+
+
 class GoogleDriveService:
     """Service for interacting with Google Drive API."""
-    
+
+    # Folder listings keyed by the folder's modifiedTime survive across
+    # runs, so unchanged folders cost one metadata call instead of a
+    # full listing. Entries expire after settings.DRIVE_LISTING_TTL
+    # seconds, since child file changes don't touch the folder's
+    # modifiedTime.
+    LISTING_CACHE_PATH = os.path.join("data", "drive_listing.cache")
+
     def __init__(self):
         """Initialize Google Drive service."""
+        self._credentials = None
         self.service = self._authenticate()
-    
+        # googleapiclient http objects are not thread-safe, so parallel
+        # transfers build one service per worker thread.
+        self._thread_local = threading.local()
+        # shelve/dbm handles are not thread-safe, so every cache access
+        # goes through this lock; atexit closes the handle so a run
+        # can't leave the dbm file in a torn state.
+        self._listing_cache = None
+        self._listing_lock = threading.Lock()
+        atexit.register(self._close_listing_cache)
+
+    def _get_listing_cache(self):
+        """Open (lazily) the on-disk folder listing cache.
+
+        Callers must hold _listing_lock.
+        """
+        if self._listing_cache is None:
+            os.makedirs(os.path.dirname(self.LISTING_CACHE_PATH), exist_ok=True)
+            self._listing_cache = shelve.open(self.LISTING_CACHE_PATH)
+        return self._listing_cache
+
+    def _close_listing_cache(self):
+        """Flush and close the listing cache if it was opened."""
+        with self._listing_lock:
+            if self._listing_cache is not None:
+                self._listing_cache.close()
+                self._listing_cache = None
+
     def _authenticate(self):
         """Authenticate with Google Drive API using service account."""
         try:
-            if os.path.exists(settings.GOOGLE_SERVICE_ACCOUNT_JSON):
-                # Use service account
-                credentials = Credentials.from_service_account_file(
-                    settings.GOOGLE_SERVICE_ACCOUNT_JSON,
-                    scopes=SCOPES
-                )
-            else:
-                logger.warning("Service account JSON not found. Using OAuth flow.")
-                credentials = self._oauth_authenticate()
-            
-            service = build("drive", "v3", credentials=credentials)
+            self._credentials = _get_credentials()
+            service = _build_service(self._credentials)
             logger.info("Successfully authenticated with Google Drive API")
             return service
         except Exception as e:
             logger.error(f"Failed to authenticate with Google Drive: {e}")
             raise
-    
-    def _oauth_authenticate(self):
-        """Authenticate using OAuth flow (for local development)."""
-        flow = InstalledAppFlow.from_client_secrets_file(
-            "credentials.json",
-            SCOPES
-        )
-        credentials = flow.run_local_server(port=0)
-        return credentials
+
+    def _thread_service(self):
+        """Get (building lazily) the Drive service for the current thread."""
+        service = getattr(self._thread_local, "service", None)
+        if service is None:
+            service = _build_service(self._credentials)
+            self._thread_local.service = service
+        return service
+
+    @staticmethod
+    def _with_backoff(fn):
+        """Run fn(), retrying rate-limit errors with exponential backoff."""
+        for attempt in range(settings.MAX_RETRIES + 1):
+            try:
+                return fn()
+            except HttpError as e:
+                if e.resp.status in (403, 429) and attempt < settings.MAX_RETRIES:
+                    delay = 2 ** attempt
+                    logger.warning(f"Drive rate limit hit, retrying in {delay}s")
+                    time.sleep(delay)
+                else:
+                    raise
     
     def list_submissions(self, folder_id: Optional[str] = None) -> List[Dict]:
         """
@@ -92,21 +180,105 @@ class GoogleDriveService:
             List of file metadata dictionaries.
         """
         try:
+            # One cheap metadata call decides whether the cached listing
+            # from a previous run is still valid.
+            # The folder pool calls this concurrently, so use the
+            # per-thread service rather than the shared one.
+            service = self._thread_service()
+
+            # Drive does not bump a folder's modifiedTime when files
+            # change inside it, so the timestamp alone would pin a
+            # stale listing forever; entries also expire after
+            # DRIVE_LISTING_TTL seconds.
+            ttl = settings.DRIVE_LISTING_TTL
+            modified_time = None
+            if ttl > 0:
+                try:
+                    meta = service.files().get(
+                        fileId=folder_id, fields="modifiedTime"
+                    ).execute()
+                    modified_time = meta.get("modifiedTime")
+                except Exception as e:
+                    logger.warning(f"Could not read modifiedTime for folder {folder_id}: {e}")
+
+            if modified_time:
+                with self._listing_lock:
+                    cached = self._get_listing_cache().get(folder_id)
+                if (
+                    cached
+                    and len(cached) == 3
+                    and cached[0] == modified_time
+                    and time.time() - cached[1] < ttl
+                ):
+                    logger.info(f"Using cached listing for folder {folder_id}")
+                    return cached[2]
+
             query = f"'{folder_id}' in parents and trashed=false"
-            results = self.service.files().list(
+            results = service.files().list(
                 q=query,
                 spaces="drive",
-                fields="files(id, name, mimeType, size, createdTime)",
+                fields="files(id, name, mimeType, size, createdTime, modifiedTime)",
                 pageSize=1000
             ).execute()
-            
+
             files = results.get("files", [])
+            if modified_time:
+                with self._listing_lock:
+                    self._get_listing_cache()[folder_id] = (modified_time, time.time(), files)
             logger.info(f"Found {len(files)} documents in folder {folder_id}")
             return files
         except Exception as e:
             logger.error(f"Error listing documents: {e}")
             raise
     
+    # Google caps batch endpoints at 100 calls per multipart request.
+    _BATCH_LIMIT = 100
+
+    def list_documents_bulk(self, folder_ids: List[str]) -> Dict[str, List[Dict]]:
+        """
+        List documents for many folders with batched metadata requests.
+
+        Coalesces up to 100 files.list calls into one multipart HTTP
+        request via the Drive batch endpoint, instead of one HTTPS
+        round-trip per folder.
+
+        Args:
+            folder_ids: Google Drive folder IDs to list.
+
+        Returns:
+            Dict mapping folder ID to its list of file metadata dicts.
+        """
+        results = {}
+
+        def _callback(request_id, response, exception):
+            if exception is not None:
+                logger.error(f"Error listing documents in folder {request_id}: {exception}")
+                results[request_id] = []
+            else:
+                results[request_id] = response.get("files", [])
+
+        try:
+            for start in range(0, len(folder_ids), self._BATCH_LIMIT):
+                batch = self.service.new_batch_http_request(callback=_callback)
+                for folder_id in folder_ids[start:start + self._BATCH_LIMIT]:
+                    query = f"'{folder_id}' in parents and trashed=false"
+                    batch.add(
+                        self.service.files().list(
+                            q=query,
+                            spaces="drive",
+                            fields="files(id, name, mimeType, size, createdTime, modifiedTime)",
+                            pageSize=1000
+                        ),
+                        request_id=folder_id,
+                    )
+                batch.execute()
+
+            logger.info(f"Listed documents for {len(folder_ids)} folders in batches")
+            return results
+        except Exception as e:
+            logger.error(f"Error in bulk document listing: {e}")
+            raise
+
     def download_file(self, file_id: str, file_name: str, destination_path: str = "downloads") -> str:
         """
         Download a file from Google Drive.
@@ -120,23 +292,140 @@ class GoogleDriveService:
             Path to the downloaded file.
         """
         try:
-            os.makedirs(destination_path, exist_ok=True)
-            file_path = os.path.join(destination_path, file_name)
-            
-            request = self.service.files().get_media(fileId=file_id)
-            file_handle = io.FileIO(file_path, "wb")
-            downloader = MediaIoBaseDownload(file_handle, request)
-            
+            return self._download_one(self.service, file_id, file_name, destination_path)
+        except Exception as e:
+            logger.error(f"Error downloading file {file_id}: {e}")
+            raise
+
+    def download_files(self, files: List[Dict], destination_path: str = "downloads") -> Dict[str, str]:
+        """
+        Download many files in parallel with a bounded thread pool.
+
+        Args:
+            files: File metadata dicts with "id" and "name" keys.
+            destination_path: Local path to save the files.
+
+        Returns:
+            Dict mapping file ID to downloaded path.
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=settings.DRIVE_CONCURRENCY) as executor:
+            futures = {
+                executor.submit(
+                    self._with_backoff,
+                    lambda f=f: self._download_one(
+                        self._thread_service(), f["id"], f["name"], destination_path
+                    ),
+                ): f["id"]
+                for f in files
+            }
+            for future in as_completed(futures):
+                file_id = futures[future]
+                try:
+                    results[file_id] = future.result()
+                except Exception as e:
+                    logger.error(f"Error downloading file {file_id}: {e}")
+        return results
+
+    def get_files_content(self, file_ids: List[str]) -> Dict[str, bytes]:
+        """
+        Fetch content for many files in parallel.
+
+        Args:
+            file_ids: Google Drive file IDs.
+
+        Returns:
+            Dict mapping file ID to content bytes.
+        """
+        results = {}
+        with ThreadPoolExecutor(max_workers=settings.DRIVE_CONCURRENCY) as executor:
+            futures = {
+                executor.submit(
+                    self._with_backoff,
+                    lambda fid=fid: self._content_one(self._thread_service(), fid),
+                ): fid
+                for fid in file_ids
+            }
+            for future in as_completed(futures):
+                file_id = futures[future]
+                try:
+                    results[file_id] = future.result()
+                except Exception as e:
+                    logger.error(f"Error getting file content {file_id}: {e}")
+        return results
+
+    def get_file_contents_async(self, file_ids: List[str]) -> Dict[str, bytes]:
+        """
+        Fetch content for many files over one async HTTP session.
+
+        A single event loop overlaps all the TLS round-trips instead of
+        holding a thread per download, with a semaphore bounding the
+        requests in flight. Falls back to the thread-pool path when
+        aiohttp is not installed.
+
+        Args:
+            file_ids: Google Drive file IDs.
+
+        Returns:
+            Dict mapping file ID to content bytes.
+        """
+        try:
+            import aiohttp
+        except ImportError:
+            logger.info("aiohttp not installed; falling back to thread-pool downloads")
+            return self.get_files_content(file_ids)
+        import asyncio
+
+        credentials = _get_credentials()
+        if not credentials.valid:
+            credentials.refresh(Request())
+        headers = {"Authorization": f"Bearer {credentials.token}"}
+
+        async def _fetch_all():
+            semaphore = asyncio.Semaphore(16)
+
+            async def _fetch(file_id):
+                url = f"https://www.googleapis.com/drive/v3/files/{file_id}?alt=media"
+                async with semaphore:
+                    async with session.get(url) as response:
+                        response.raise_for_status()
+                        return await response.read()
+
+            async with aiohttp.ClientSession(headers=headers) as session:
+                contents = await asyncio.gather(
+                    *(_fetch(fid) for fid in file_ids), return_exceptions=True
+                )
+
+            results = {}
+            for file_id, content in zip(file_ids, contents):
+                if isinstance(content, Exception):
+                    logger.error(f"Error getting file content {file_id}: {content}")
+                else:
+                    results[file_id] = content
+            return results
+
+        return asyncio.run(_fetch_all())
+
+    def _download_one(self, service, file_id: str, file_name: str, destination_path: str) -> str:
+        """Download a single file using the given service instance."""
+        os.makedirs(destination_path, exist_ok=True)
+        file_path = os.path.join(destination_path, file_name)
+
+        request = service.files().get_media(fileId=file_id)
+        file_handle = io.FileIO(file_path, "wb")
+        try:
+            downloader = MediaIoBaseDownload(
+                file_handle, request, chunksize=settings.DRIVE_CHUNK_SIZE
+            )
+
             done = False
             while not done:
                 status, done = downloader.next_chunk()
-            
+        finally:
             file_handle.close()
-            logger.info(f"Downloaded {file_name} to {file_path}")
-            return file_path
-        except Exception as e:
-            logger.error(f"Error downloading file {file_id}: {e}")
-            raise
+
+        logger.info(f"Downloaded {file_name} to {file_path}")
+        return file_path
     
     def get_file_content(self, file_id: str) -> bytes:
         """
@@ -149,15 +438,56 @@ class GoogleDriveService:
             File content as bytes.
         """
         try:
-            request = self.service.files().get_media(fileId=file_id)
+            # Called from the workflow's document pool, so use the
+            # per-thread service (the shared one is not thread-safe).
+            return self._content_one(self._thread_service(), file_id)
+        except Exception as e:
+            logger.error(f"Error getting file content {file_id}: {e}")
+            raise
+
+    def get_file_stream(self, file_id: str) -> io.BytesIO:
+        """
+        Get file content as a seekable stream.
+
+        Saves the extra full-buffer copy get_file_content pays via
+        getvalue(); parsers that need random access (PDF xref tables
+        sit at the end of the file) can consume the buffer in place.
+
+        Args:
+            file_id: Google Drive file ID.
+
+        Returns:
+            Seekable stream positioned at the start of the content.
+        """
+        try:
+            # Same per-thread service as get_file_content: the document
+            # pool calls this from worker threads.
+            request = self._thread_service().files().get_media(fileId=file_id)
             file_handle = io.BytesIO()
-            downloader = MediaIoBaseDownload(file_handle, request)
-            
+            downloader = MediaIoBaseDownload(
+                file_handle, request, chunksize=settings.DRIVE_CHUNK_SIZE
+            )
+
             done = False
             while not done:
                 status, done = downloader.next_chunk()
-            
-            return file_handle.getvalue()
+
+            file_handle.seek(0)
+            return file_handle
         except Exception as e:
-            logger.error(f"Error getting file content {file_id}: {e}")
+            logger.error(f"Error getting file stream {file_id}: {e}")
             raise
+
+    def _content_one(self, service, file_id: str) -> bytes:
+        """Fetch a single file's content using the given service instance."""
+        request = service.files().get_media(fileId=file_id)
+        file_handle = io.BytesIO()
+        downloader = MediaIoBaseDownload(
+            file_handle, request, chunksize=settings.DRIVE_CHUNK_SIZE
+        )
+
+        done = False
+        while not done:
+            status, done = downloader.next_chunk()
+
+        return file_handle.getvalue()
@@ -3,31 +3,82 @@
 Stores submissions, documents, and scores in-memory and persists to
 `data/store.json` for simple long-running runs without SQL.
 """
+import atexit
+import heapq
 import json
 import os
+import threading
+from collections import defaultdict
 from typing import List, Optional
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from src.config import settings
 from src.models.schemas import Submission, Document, Score
 
 
+def _json_dumps(obj: dict) -> str:
+    """Serialize with orjson when available (2-10x faster than stdlib)."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str).decode("utf-8")
+    return json.dumps(obj, default=str)
+
+
 class DatabaseService:
     """Simple DatabaseService that mimics the original interface.
 
-    Data is persisted to `data/store.json` so results survive process restarts.
+    Data is persisted to `data/store.json` so results survive process
+    restarts. Mutations append one line to a JSONL write-ahead log
+    (`store.json.log`) instead of rewriting the whole snapshot; the log
+    is replayed on load and folded back into the snapshot by compact().
+
+    The workflow mutates one shared instance from several worker
+    threads, so every mutation and compaction runs under one re-entrant
+    lock; ID allocation, log appends, and snapshot writes never
+    interleave.
     """
 
     FILE_PATH = os.path.join(os.getcwd(), "data", "store.json")
+    LOG_PATH = FILE_PATH + ".log"
 
     def __init__(self):
         os.makedirs(os.path.dirname(self.FILE_PATH), exist_ok=True)
+        self._lock = threading.RLock()
+        self._log_file = None
+        self._dirty = False
         self._load()
+        atexit.register(self.flush)
+        if settings.DB_FLUSH_INTERVAL > 0:
+            self._start_background_flusher(settings.DB_FLUSH_INTERVAL)
+
+    def _start_background_flusher(self, interval: float):
+        """Flush pending writes from a daemon thread every `interval` seconds."""
+
+        def _loop():
+            while True:
+                threading.Event().wait(interval)
+                self.flush()
+
+        thread = threading.Thread(target=_loop, daemon=True, name="store-flusher")
+        thread.start()
+
+    def flush(self):
+        """Fold pending log entries into the snapshot, if any."""
+        with self._lock:
+            if self._dirty:
+                self.compact()
+                self._dirty = False
 
     def _load(self):
         if os.path.exists(self.FILE_PATH):
             try:
-                with open(self.FILE_PATH, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                with open(self.FILE_PATH, "rb") as f:
+                    raw = f.read()
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw)
             except Exception:
                 data = {}
         else:
@@ -39,146 +90,352 @@ class DatabaseService:
         self.next_submission_id = data.get("next_submission_id", 1)
         self.next_document_id = data.get("next_document_id", 1)
         self.next_score_id = data.get("next_score_id", 1)
+        self._build_indexes()
+        self._replay_log()
+
+    def _replay_log(self):
+        """Apply write-ahead log entries left by a previous run."""
+        if not os.path.exists(self.LOG_PATH):
+            return
+        with open(self.LOG_PATH, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn final write from a crash; ignore it.
+                    continue
+                self._apply_log_entry(entry)
+
+    def _apply_log_entry(self, entry: dict):
+        op = entry["op"]
+        data = entry["data"]
+        if op == "create_submission":
+            self.submissions.append(data)
+            self._sub_by_id[data["id"]] = data
+            self._sub_by_folder[data.get("submission_folder_id")] = data
+            self.next_submission_id = max(self.next_submission_id, data["id"] + 1)
+        elif op == "create_document":
+            self.documents.append(data)
+            self._doc_by_id[data["id"]] = data
+            self._docs_by_sub[data["submission_id"]].append(data)
+            self.next_document_id = max(self.next_document_id, data["id"] + 1)
+        elif op == "create_score":
+            self.scores.append(data)
+            self._scores_by_doc[data["document_id"]].append(data)
+            self._scores_by_sub[data["submission_id"]].append(data)
+            self.next_score_id = max(self.next_score_id, data["id"] + 1)
+        elif op == "update_submission":
+            s = self._sub_by_id.get(entry["id"])
+            if s:
+                s.update(data)
+        elif op == "update_document":
+            d = self._doc_by_id.get(entry["id"])
+            if d:
+                d.update(data)
+
+    def _append_log(self, op: str, data: dict, **extra):
+        """Append one mutation to the write-ahead log (O(record size)).
+
+        Callers hold self._lock, so the append can never interleave
+        with compact() closing the handle.
+        """
+        if self._log_file is None:
+            self._log_file = open(self.LOG_PATH, "a", encoding="utf-8")
+        self._log_file.write(_json_dumps({"op": op, **extra, "data": data}) + "\n")
+        self._log_file.flush()
+        self._dirty = True
+
+    def compact(self):
+        """Fold the write-ahead log into the snapshot and truncate it."""
+        with self._lock:
+            self._save()
+            if self._log_file is not None:
+                self._log_file.close()
+                self._log_file = None
+            if os.path.exists(self.LOG_PATH):
+                os.remove(self.LOG_PATH)
+
+    def _build_indexes(self):
+        """Build hash indexes so lookups are O(1) instead of list scans."""
+        self._sub_by_id = {s["id"]: s for s in self.submissions}
+        self._sub_by_folder = {s.get("submission_folder_id"): s for s in self.submissions}
+        self._doc_by_id = {d["id"]: d for d in self.documents}
+        self._docs_by_sub = defaultdict(list)
+        for d in self.documents:
+            self._docs_by_sub[d["submission_id"]].append(d)
+        self._scores_by_doc = defaultdict(list)
+        self._scores_by_sub = defaultdict(list)
+        for s in self.scores:
+            self._scores_by_doc[s["document_id"]].append(s)
+            self._scores_by_sub[s["submission_id"]].append(s)
 
     def _save(self):
-        data = {
-            "submissions": self.submissions,
-            "documents": self.documents,
-            "scores": self.scores,
-            "next_submission_id": self.next_submission_id,
-            "next_document_id": self.next_document_id,
-            "next_score_id": self.next_score_id,
-        }
+        """Stream the snapshot to disk one record at a time.
+
+        Serializing record by record keeps peak memory at one encoded
+        row instead of an extra full copy of the store.
+        """
         tmp = self.FILE_PATH + ".tmp"
         with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f, default=str, indent=2)
+            f.write("{")
+            for key, records in (
+                ("submissions", self.submissions),
+                ("documents", self.documents),
+                ("scores", self.scores),
+            ):
+                f.write(f'"{key}":[')
+                for i, record in enumerate(records):
+                    if i:
+                        f.write(",")
+                    f.write(_json_dumps(record))
+                f.write("],")
+            f.write(
+                f'"next_submission_id":{self.next_submission_id},'
+                f'"next_document_id":{self.next_document_id},'
+                f'"next_score_id":{self.next_score_id}}}'
+            )
         os.replace(tmp, self.FILE_PATH)
 
     # Submission methods
     def create_submission(self, submission: Submission) -> int:
-        sid = self.next_submission_id
-        self.next_submission_id += 1
-
-        item = {
-            "id": sid,
-            "applicant_name": submission.applicant_name,
-            "applicant_email": submission.applicant_email,
-            "submission_folder_id": submission.submission_folder_id,
-            "status": submission.status,
-            "created_at": submission.created_at.isoformat() if submission.created_at else datetime.utcnow().isoformat(),
-            "updated_at": submission.updated_at.isoformat() if submission.updated_at else datetime.utcnow().isoformat(),
-            "error_message": submission.error_message,
-        }
-        self.submissions.append(item)
-        self._save()
-        return sid
+        with self._lock:
+            sid = self.next_submission_id
+            self.next_submission_id += 1
+
+            item = {
+                "id": sid,
+                "applicant_name": submission.applicant_name,
+                "applicant_email": submission.applicant_email,
+                "submission_folder_id": submission.submission_folder_id,
+                "status": submission.status,
+                "created_at": submission.created_at.isoformat() if submission.created_at else datetime.utcnow().isoformat(),
+                "updated_at": submission.updated_at.isoformat() if submission.updated_at else datetime.utcnow().isoformat(),
+                "error_message": submission.error_message,
+            }
+            self.submissions.append(item)
+            self._sub_by_id[sid] = item
+            self._sub_by_folder[item["submission_folder_id"]] = item
+            self._append_log("create_submission", item)
+            return sid
 
     def get_submission(self, submission_id: int) -> Optional[Submission]:
-        s = next((x for x in self.submissions if x["id"] == submission_id), None)
+        s = self._sub_by_id.get(submission_id)
         if not s:
             return None
-
-        docs = [self._document_dict_to_schema(d) for d in self.documents if d["submission_id"] == submission_id]
-        scores = [self._score_dict_to_schema(sc) for sc in self.scores if sc["submission_id"] == submission_id]
-
-        return Submission(
-            id=s["id"],
-            applicant_name=s.get("applicant_name", ""),
-            applicant_email=s.get("applicant_email", ""),
-            submission_folder_id=s.get("submission_folder_id", ""),
-            documents=docs,
-            scores=scores,
-            status=s.get("status", "pending"),
-            created_at=datetime.fromisoformat(s.get("created_at")) if s.get("created_at") else datetime.utcnow(),
-            updated_at=datetime.fromisoformat(s.get("updated_at")) if s.get("updated_at") else datetime.utcnow(),
-            error_message=s.get("error_message"),
-        )
+        return self._submission_dict_to_schema(s)
 
     def get_submission_by_folder_id(self, folder_id: str) -> Optional[Submission]:
-        s = next((x for x in self.submissions if x.get("submission_folder_id") == folder_id), None)
+        s = self._sub_by_folder.get(folder_id)
         if not s:
             return None
-        return self.get_submission(s["id"])
+        return self._submission_dict_to_schema(s)
 
     def list_submissions(self, status: Optional[str] = None) -> List[Submission]:
-        items = self.submissions if status is None else [x for x in self.submissions if x.get("status") == status]
-        return [self.get_submission(x["id"]) for x in items]
+        return [
+            self._submission_dict_to_schema(x)
+            for x in self.submissions
+            if status is None or x.get("status") == status
+        ]
+
+    def iter_submissions(self, status: Optional[str] = None):
+        """Yield submissions one at a time instead of building a list."""
+        for x in self.submissions:
+            if status is None or x.get("status") == status:
+                yield self._submission_dict_to_schema(x)
 
     def update_submission_status(self, submission_id: int, status: str, error_message: Optional[str] = None) -> None:
-        s = next((x for x in self.submissions if x["id"] == submission_id), None)
-        if s:
-            s["status"] = status
-            if error_message:
-                s["error_message"] = error_message
-            s["updated_at"] = datetime.utcnow().isoformat()
-            self._save()
+        with self._lock:
+            s = self._sub_by_id.get(submission_id)
+            if s:
+                s["status"] = status
+                if error_message:
+                    s["error_message"] = error_message
+                s["updated_at"] = datetime.utcnow().isoformat()
+                self._append_log(
+                    "update_submission",
+                    {"status": s["status"], "error_message": s.get("error_message"), "updated_at": s["updated_at"]},
+                    id=submission_id,
+                )
 
     # Document methods
     def create_document(self, submission_id: int, document: Document) -> int:
-        did = self.next_document_id
-        self.next_document_id += 1
-
-        item = {
-            "id": did,
-            "submission_id": submission_id,
-            "name": document.name,
-            "google_drive_id": document.google_drive_id,
-            "mime_type": document.mime_type,
-            "category": document.category,
-            "downloaded_path": document.downloaded_path,
-            "file_size": document.file_size,
-            "created_at": document.created_at.isoformat() if document.created_at else datetime.utcnow().isoformat(),
-            "processed": bool(document.processed),
-            "error_message": document.error_message,
-        }
-        self.documents.append(item)
-        self._save()
-        return did
+        with self._lock:
+            did = self.next_document_id
+            self.next_document_id += 1
+
+            item = {
+                "id": did,
+                "submission_id": submission_id,
+                "name": document.name,
+                "google_drive_id": document.google_drive_id,
+                "mime_type": document.mime_type,
+                "category": document.category,
+                "downloaded_path": document.downloaded_path,
+                "file_size": document.file_size,
+                "created_at": document.created_at.isoformat() if document.created_at else datetime.utcnow().isoformat(),
+                "processed": bool(document.processed),
+                "error_message": document.error_message,
+            }
+            self.documents.append(item)
+            self._doc_by_id[did] = item
+            self._docs_by_sub[submission_id].append(item)
+            self._append_log("create_document", item)
+            return did
+
+    def bulk_create_documents(self, submission_id: int, documents: List[Document]) -> List[int]:
+        """Create many documents at once (each is one log append)."""
+        with self._lock:
+            return [self.create_document(submission_id, d) for d in documents]
 
     def get_document(self, document_id: int) -> Optional[Document]:
-        d = next((x for x in self.documents if x["id"] == document_id), None)
+        d = self._doc_by_id.get(document_id)
         if not d:
             return None
         return self._document_dict_to_schema(d)
 
     def list_documents(self, submission_id: int) -> List[Document]:
-        return [self._document_dict_to_schema(d) for d in self.documents if d["submission_id"] == submission_id]
+        return [self._document_dict_to_schema(d) for d in self._docs_by_sub.get(submission_id, [])]
 
     def update_document(self, document_id: int, **kwargs) -> None:
-        d = next((x for x in self.documents if x["id"] == document_id), None)
-        if d:
-            for k, v in kwargs.items():
-                if k in d:
-                    d[k] = v
-            self._save()
+        with self._lock:
+            d = self._doc_by_id.get(document_id)
+            if d:
+                changed = {k: v for k, v in kwargs.items() if k in d}
+                d.update(changed)
+                self._append_log("update_document", changed, id=document_id)
 
     # Score methods
     def create_score(self, submission_id: int, score: Score) -> int:
-        sid = self.next_score_id
-        self.next_score_id += 1
-
-        item = {
-            "id": sid,
-            "document_id": score.document_id,
-            "submission_id": submission_id,
-            "category": score.category,
-            "total_score": score.total_score,
-            "max_score": score.max_score,
-            "criteria_scores": score.criteria_scores,
-            "feedback": score.feedback,
-            "created_at": score.created_at.isoformat() if score.created_at else datetime.utcnow().isoformat(),
-        }
-        self.scores.append(item)
-        self._save()
-        return sid
+        with self._lock:
+            sid = self.next_score_id
+            self.next_score_id += 1
+
+            item = {
+                "id": sid,
+                "document_id": score.document_id,
+                "submission_id": submission_id,
+                "category": score.category,
+                "total_score": score.total_score,
+                "max_score": score.max_score,
+                "criteria_scores": score.criteria_scores,
+                "feedback": score.feedback,
+                "created_at": score.created_at.isoformat() if score.created_at else datetime.utcnow().isoformat(),
+            }
+            self.scores.append(item)
+            self._scores_by_doc[score.document_id].append(item)
+            self._scores_by_sub[submission_id].append(item)
+            self._append_log("create_score", item)
+            return sid
+
+    def bulk_create_scores(self, submission_id: int, scores: List[Score]) -> List[int]:
+        """Create many scores at once (each is one log append)."""
+        with self._lock:
+            return [self.create_score(submission_id, s) for s in scores]
 
     def get_scores(self, document_id: int) -> List[Score]:
-        return [self._score_dict_to_schema(s) for s in self.scores if s["document_id"] == document_id]
+        return [self._score_dict_to_schema(s) for s in self._scores_by_doc.get(document_id, [])]
 
     def get_submission_scores(self, submission_id: int) -> List[Score]:
-        return [self._score_dict_to_schema(s) for s in self.scores if s["submission_id"] == submission_id]
+        return [self._score_dict_to_schema(s) for s in self._scores_by_sub.get(submission_id, [])]
+
+    def get_scores_for_submissions(self, submission_ids: List[int]) -> dict:
+        """Get scores for many submissions at once, bucketed by id."""
+        return {
+            sid: [self._score_dict_to_schema(s) for s in self._scores_by_sub.get(sid, [])]
+            for sid in submission_ids
+        }
+
+    # Aggregate methods
+    def get_submission_stats(self) -> dict:
+        """Summary counters computed in one pass over the raw rows."""
+        status_counts = {}
+        for s in self.submissions:
+            status = s.get("status", "pending")
+            status_counts[status] = status_counts.get(status, 0) + 1
+
+        score_count = 0
+        score_total = 0.0
+        high_score = 0
+        low_score = 0
+        for s in self.scores:
+            total_score = s.get("total_score", 0)
+            if score_count == 0:
+                high_score = low_score = total_score
+            else:
+                high_score = max(high_score, total_score)
+                low_score = min(low_score, total_score)
+            score_count += 1
+            score_total += total_score
+
+        return {
+            "total_submissions": len(self.submissions),
+            "completed": status_counts.get("completed", 0),
+            "processing": status_counts.get("processing", 0),
+            "errors": status_counts.get("error", 0),
+            "total_documents": len(self.documents),
+            "average_score": score_total / score_count if score_count else 0,
+            "high_score": high_score,
+            "low_score": low_score,
+        }
+
+    def get_category_stats(self) -> dict:
+        """Per-category score roll-up in one pass over the raw rows."""
+        categories = {}
+        for s in self.scores:
+            total_score = s.get("total_score", 0)
+            entry = categories.get(s.get("category"))
+            if entry is None:
+                categories[s.get("category")] = {
+                    "count": 1,
+                    "total_score": total_score,
+                    "avg_score": total_score,
+                    "min_score": total_score,
+                    "max_score": total_score,
+                }
+            else:
+                entry["count"] += 1
+                entry["total_score"] += total_score
+                entry["min_score"] = min(entry["min_score"], total_score)
+                entry["max_score"] = max(entry["max_score"], total_score)
+        for entry in categories.values():
+            entry["avg_score"] = entry["total_score"] / entry["count"]
+        return categories
+
+    def get_top_applicants(self, limit: int = 10) -> List[dict]:
+        """Top applicants by summed score, via a bounded heap selection."""
+        rows = (
+            {
+                "applicant_name": s.get("applicant_name", ""),
+                "applicant_email": s.get("applicant_email", ""),
+                "total_score": sum(
+                    sc.get("total_score", 0) for sc in self._scores_by_sub.get(s["id"], [])
+                ),
+                "document_count": len(self._docs_by_sub.get(s["id"], [])),
+                "status": s.get("status", "pending"),
+            }
+            for s in self.submissions
+        )
+        return heapq.nlargest(limit, rows, key=lambda r: r["total_score"])
 
     # Helpers to convert dicts to Pydantic schemas
+    def _submission_dict_to_schema(self, s: dict) -> Submission:
+        submission_id = s["id"]
+        return Submission(
+            id=submission_id,
+            applicant_name=s.get("applicant_name", ""),
+            applicant_email=s.get("applicant_email", ""),
+            submission_folder_id=s.get("submission_folder_id", ""),
+            documents=[self._document_dict_to_schema(d) for d in self._docs_by_sub.get(submission_id, [])],
+            scores=[self._score_dict_to_schema(sc) for sc in self._scores_by_sub.get(submission_id, [])],
+            status=s.get("status", "pending"),
+            created_at=datetime.fromisoformat(s.get("created_at")) if s.get("created_at") else datetime.utcnow(),
+            updated_at=datetime.fromisoformat(s.get("updated_at")) if s.get("updated_at") else datetime.utcnow(),
+            error_message=s.get("error_message"),
+        )
+
     def _document_dict_to_schema(self, d: dict) -> Document:
         return Document(
             id=d.get("id"),
@@ -0,0 +1,383 @@
+"""A stdlib-sqlite3 DatabaseService with the same public API.
+
+Drop-in alternative to `simple_database_service` for runs whose history
+outgrows an in-memory JSON store: rows live on disk in `data/store.db`,
+lookups go through indexes instead of Python list scans, and WAL
+journaling keeps writes O(row) while allowing concurrent readers.
+Writes from the workflow's worker threads share one connection, so all
+mutations serialize on a re-entrant lock (check_same_thread alone does
+not make sqlite3 connections thread-safe).
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import List, Optional
+
+from src.models.schemas import Submission, Document, Score
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    applicant_name TEXT,
+    applicant_email TEXT,
+    submission_folder_id TEXT UNIQUE,
+    status TEXT,
+    created_at TEXT,
+    updated_at TEXT,
+    error_message TEXT
+);
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    submission_id INTEGER,
+    name TEXT,
+    google_drive_id TEXT,
+    mime_type TEXT,
+    category TEXT,
+    downloaded_path TEXT,
+    file_size INTEGER,
+    created_at TEXT,
+    processed INTEGER,
+    error_message TEXT,
+    FOREIGN KEY(submission_id) REFERENCES submissions(id)
+);
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER,
+    submission_id INTEGER,
+    category TEXT,
+    total_score REAL,
+    max_score REAL,
+    criteria_scores TEXT,
+    feedback TEXT,
+    created_at TEXT,
+    FOREIGN KEY(document_id) REFERENCES documents(id),
+    FOREIGN KEY(submission_id) REFERENCES submissions(id)
+);
+CREATE INDEX IF NOT EXISTS idx_sub_folder ON submissions(submission_folder_id);
+CREATE INDEX IF NOT EXISTS idx_sub_status ON submissions(status);
+CREATE INDEX IF NOT EXISTS idx_doc_sub ON documents(submission_id);
+CREATE INDEX IF NOT EXISTS idx_score_doc ON scores(document_id);
+CREATE INDEX IF NOT EXISTS idx_score_sub ON scores(submission_id);
+"""
+
+
+class DatabaseService:
+    """SQLite-backed DatabaseService mirroring the simple-store interface."""
+
+    FILE_PATH = os.path.join(os.getcwd(), "data", "store.db")
+
+    def __init__(self):
+        os.makedirs(os.path.dirname(self.FILE_PATH), exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(self.FILE_PATH, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        """Close the underlying connection."""
+        self._conn.close()
+
+    # Submission methods
+    def create_submission(self, submission: Submission) -> int:
+        now = datetime.utcnow().isoformat()
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT INTO submissions (applicant_name, applicant_email, "
+                "submission_folder_id, status, created_at, updated_at, error_message) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    submission.applicant_name,
+                    submission.applicant_email,
+                    submission.submission_folder_id,
+                    submission.status,
+                    submission.created_at.isoformat() if submission.created_at else now,
+                    submission.updated_at.isoformat() if submission.updated_at else now,
+                    submission.error_message,
+                ),
+            )
+            self._conn.commit()
+            return cur.lastrowid
+
+    def get_submission(self, submission_id: int) -> Optional[Submission]:
+        row = self._conn.execute(
+            "SELECT * FROM submissions WHERE id = ?", (submission_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return self._row_to_submission(row)
+
+    def get_submission_by_folder_id(self, folder_id: str) -> Optional[Submission]:
+        row = self._conn.execute(
+            "SELECT * FROM submissions WHERE submission_folder_id = ?", (folder_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return self._row_to_submission(row)
+
+    def list_submissions(self, status: Optional[str] = None) -> List[Submission]:
+        return list(self.iter_submissions(status))
+
+    def iter_submissions(self, status: Optional[str] = None):
+        """Yield submissions one at a time instead of building a list."""
+        if status is None:
+            cursor = self._conn.execute("SELECT * FROM submissions ORDER BY id")
+        else:
+            cursor = self._conn.execute(
+                "SELECT * FROM submissions WHERE status = ? ORDER BY id", (status,)
+            )
+        for row in cursor:
+            yield self._row_to_submission(row)
+
+    def update_submission_status(self, submission_id: int, status: str, error_message: Optional[str] = None) -> None:
+        with self._lock:
+            if error_message:
+                self._conn.execute(
+                    "UPDATE submissions SET status = ?, error_message = ?, updated_at = ? WHERE id = ?",
+                    (status, error_message, datetime.utcnow().isoformat(), submission_id),
+                )
+            else:
+                self._conn.execute(
+                    "UPDATE submissions SET status = ?, updated_at = ? WHERE id = ?",
+                    (status, datetime.utcnow().isoformat(), submission_id),
+                )
+            self._conn.commit()
+
+    # Document methods
+    def _insert_document(self, submission_id: int, document: Document) -> int:
+        """Insert one document row without committing; returns its ID."""
+        cur = self._conn.execute(
+            "INSERT INTO documents (submission_id, name, google_drive_id, mime_type, "
+            "category, downloaded_path, file_size, created_at, processed, error_message) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                submission_id,
+                document.name,
+                document.google_drive_id,
+                document.mime_type,
+                document.category,
+                document.downloaded_path,
+                document.file_size,
+                document.created_at.isoformat() if document.created_at else datetime.utcnow().isoformat(),
+                int(bool(document.processed)),
+                document.error_message,
+            ),
+        )
+        return cur.lastrowid
+
+    def create_document(self, submission_id: int, document: Document) -> int:
+        with self._lock:
+            document_id = self._insert_document(submission_id, document)
+            self._conn.commit()
+            return document_id
+
+    def bulk_create_documents(self, submission_id: int, documents: List[Document]) -> List[int]:
+        """Create many documents in one transaction (one commit, not one per row)."""
+        with self._lock:
+            try:
+                ids = [self._insert_document(submission_id, d) for d in documents]
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+            return ids
+
+    def get_document(self, document_id: int) -> Optional[Document]:
+        row = self._conn.execute(
+            "SELECT * FROM documents WHERE id = ?", (document_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return self._row_to_document(row)
+
+    def list_documents(self, submission_id: int) -> List[Document]:
+        cursor = self._conn.execute(
+            "SELECT * FROM documents WHERE submission_id = ? ORDER BY id", (submission_id,)
+        )
+        return [self._row_to_document(row) for row in cursor]
+
+    def update_document(self, document_id: int, **kwargs) -> None:
+        columns = {
+            "name", "google_drive_id", "mime_type", "category",
+            "downloaded_path", "file_size", "processed", "error_message",
+        }
+        changed = {k: v for k, v in kwargs.items() if k in columns}
+        if not changed:
+            return
+        if "processed" in changed:
+            changed["processed"] = int(bool(changed["processed"]))
+        assignments = ", ".join(f"{k} = ?" for k in changed)
+        with self._lock:
+            self._conn.execute(
+                f"UPDATE documents SET {assignments} WHERE id = ?",
+                (*changed.values(), document_id),
+            )
+            self._conn.commit()
+
+    # Score methods
+    def _insert_score(self, submission_id: int, score: Score) -> int:
+        """Insert one score row without committing; returns its ID."""
+        cur = self._conn.execute(
+            "INSERT INTO scores (document_id, submission_id, category, total_score, "
+            "max_score, criteria_scores, feedback, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                score.document_id,
+                submission_id,
+                score.category,
+                score.total_score,
+                score.max_score,
+                json.dumps(score.criteria_scores or {}),
+                score.feedback,
+                score.created_at.isoformat() if score.created_at else datetime.utcnow().isoformat(),
+            ),
+        )
+        return cur.lastrowid
+
+    def create_score(self, submission_id: int, score: Score) -> int:
+        with self._lock:
+            score_id = self._insert_score(submission_id, score)
+            self._conn.commit()
+            return score_id
+
+    def bulk_create_scores(self, submission_id: int, scores: List[Score]) -> List[int]:
+        """Create many scores in one transaction (one commit, not one per row)."""
+        with self._lock:
+            try:
+                ids = [self._insert_score(submission_id, s) for s in scores]
+                self._conn.commit()
+            except Exception:
+                self._conn.rollback()
+                raise
+            return ids
+
+    def get_scores(self, document_id: int) -> List[Score]:
+        cursor = self._conn.execute(
+            "SELECT * FROM scores WHERE document_id = ? ORDER BY id", (document_id,)
+        )
+        return [self._row_to_score(row) for row in cursor]
+
+    def get_submission_scores(self, submission_id: int) -> List[Score]:
+        cursor = self._conn.execute(
+            "SELECT * FROM scores WHERE submission_id = ? ORDER BY id", (submission_id,)
+        )
+        return [self._row_to_score(row) for row in cursor]
+
+    def get_scores_for_submissions(self, submission_ids: List[int]) -> dict:
+        """Get scores for many submissions with one IN query."""
+        if not submission_ids:
+            return {}
+        placeholders = ",".join("?" * len(submission_ids))
+        buckets = {sid: [] for sid in submission_ids}
+        cursor = self._conn.execute(
+            f"SELECT * FROM scores WHERE submission_id IN ({placeholders}) ORDER BY id",
+            submission_ids,
+        )
+        for row in cursor:
+            buckets.setdefault(row["submission_id"], []).append(self._row_to_score(row))
+        return buckets
+
+    # Aggregate methods
+    def get_submission_stats(self) -> dict:
+        """Summary counters computed by SQLite, no row hydration."""
+        status_counts = dict(self._conn.execute(
+            "SELECT status, COUNT(*) FROM submissions GROUP BY status"
+        ).fetchall())
+        total_documents = self._conn.execute(
+            "SELECT COUNT(*) FROM documents"
+        ).fetchone()[0]
+        score_count, avg_score, high_score, low_score = self._conn.execute(
+            "SELECT COUNT(*), AVG(total_score), MAX(total_score), MIN(total_score) FROM scores"
+        ).fetchone()
+        return {
+            "total_submissions": sum(status_counts.values()),
+            "completed": status_counts.get("completed", 0),
+            "processing": status_counts.get("processing", 0),
+            "errors": status_counts.get("error", 0),
+            "total_documents": total_documents,
+            "average_score": avg_score if score_count else 0,
+            "high_score": high_score if score_count else 0,
+            "low_score": low_score if score_count else 0,
+        }
+
+    def get_category_stats(self) -> dict:
+        """Per-category score roll-up via one GROUP BY query."""
+        rows = self._conn.execute(
+            "SELECT category, COUNT(*), SUM(total_score), AVG(total_score), "
+            "MIN(total_score), MAX(total_score) FROM scores GROUP BY category"
+        ).fetchall()
+        return {
+            category: {
+                "count": count,
+                "total_score": total or 0,
+                "avg_score": avg or 0,
+                "min_score": low or 0,
+                "max_score": high or 0,
+            }
+            for category, count, total, avg, low, high in rows
+        }
+
+    def get_top_applicants(self, limit: int = 10) -> List[dict]:
+        """Top applicants by summed score via grouped ORDER BY + LIMIT."""
+        rows = self._conn.execute(
+            "SELECT s.applicant_name, s.applicant_email, "
+            "COALESCE(sc.total, 0) AS total_score, "
+            "COALESCE(d.cnt, 0) AS document_count, s.status "
+            "FROM submissions s "
+            "LEFT JOIN (SELECT submission_id, SUM(total_score) AS total "
+            "FROM scores GROUP BY submission_id) sc ON sc.submission_id = s.id "
+            "LEFT JOIN (SELECT submission_id, COUNT(*) AS cnt "
+            "FROM documents GROUP BY submission_id) d ON d.submission_id = s.id "
+            "ORDER BY total_score DESC LIMIT ?",
+            (limit,),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    # Helpers to convert rows to Pydantic schemas
+    def _row_to_submission(self, row: sqlite3.Row) -> Submission:
+        return Submission(
+            id=row["id"],
+            applicant_name=row["applicant_name"] or "",
+            applicant_email=row["applicant_email"] or "",
+            submission_folder_id=row["submission_folder_id"] or "",
+            documents=self.list_documents(row["id"]),
+            scores=self.get_submission_scores(row["id"]),
+            status=row["status"] or "pending",
+            created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else datetime.utcnow(),
+            updated_at=datetime.fromisoformat(row["updated_at"]) if row["updated_at"] else datetime.utcnow(),
+            error_message=row["error_message"],
+        )
+
+    def _row_to_document(self, row: sqlite3.Row) -> Document:
+        return Document(
+            id=row["id"],
+            name=row["name"],
+            google_drive_id=row["google_drive_id"],
+            mime_type=row["mime_type"],
+            category=row["category"],
+            submission_id=row["submission_id"],
+            downloaded_path=row["downloaded_path"],
+            file_size=row["file_size"] or 0,
+            created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else datetime.utcnow(),
+            processed=bool(row["processed"]),
+            error_message=row["error_message"],
+        )
+
+    def _row_to_score(self, row: sqlite3.Row) -> Score:
+        return Score(
+            id=row["id"],
+            document_id=row["document_id"],
+            category=row["category"],
+            total_score=row["total_score"] or 0.0,
+            max_score=row["max_score"] or 100.0,
+            criteria_scores=json.loads(row["criteria_scores"]) if row["criteria_scores"] else {},
+            feedback=row["feedback"],
+            created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else datetime.utcnow(),
+        )
@@ -1,4 +1,5 @@
 """Utility functions."""
+from .preview import preview
 from .text_extractor import TextExtractor
 
-__all__ = ["TextExtractor"]
+__all__ = ["TextExtractor", "preview"]
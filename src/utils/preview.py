@@ -0,0 +1,42 @@
+"""Token-aware text previews for model prompts."""
+import functools
+import re
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Rough chars-per-token ratio for the fallback truncation.
+_CHARS_PER_TOKEN = 4
+
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    return tiktoken.encoding_for_model("gpt-3.5-turbo")
+
+
+def preview(text: str, max_tokens: int) -> str:
+    """Collapse whitespace and cut text to a token budget.
+
+    Character slices like content[:2000] can carry well over 1000
+    tokens of dense text or waste the budget on whitespace runs. This
+    counts real tokens with tiktoken when it is installed; otherwise it
+    falls back to a character slice at ~4 characters per token.
+
+    Args:
+        text: Raw document text.
+        max_tokens: Token budget for the preview.
+
+    Returns:
+        Whitespace-normalized text within the token budget.
+    """
+    text = _WHITESPACE_RE.sub(" ", text).strip()
+    if tiktoken is not None:
+        tokens = _encoding().encode(text)
+        if len(tokens) <= max_tokens:
+            return text
+        return _encoding().decode(tokens[:max_tokens])
+    return text[:max_tokens * _CHARS_PER_TOKEN]
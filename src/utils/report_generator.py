@@ -1,101 +1,71 @@
 """Query and reporting utilities for scholarship submissions."""
 import logging
 from typing import List, Dict, Optional
-from src.services import DatabaseService
+from src.services import get_db_service
 
 logger = logging.getLogger(__name__)
 
 
 class ReportGenerator:
     """Generate reports from submission data."""
-    
-    def __init__(self):
-        """Initialize report generator."""
-        self.db_service = DatabaseService()
+
+    def __init__(self, db_service=None):
+        """Initialize report generator.
+
+        Args:
+            db_service: Database service to query. Defaults to the
+                shared instance.
+        """
+        self.db_service = db_service or get_db_service()
     
     def generate_summary_report(self) -> Dict:
-        """Generate a summary report of all submissions."""
-        submissions = self.db_service.list_submissions()
-        
-        total_submissions = len(submissions)
-        completed = len([s for s in submissions if s.status == "completed"])
-        processing = len([s for s in submissions if s.status == "processing"])
-        errors = len([s for s in submissions if s.status == "error"])
-        
-        all_scores = []
-        for submission in submissions:
-            scores = self.db_service.get_submission_scores(submission.id)
-            all_scores.extend(scores)
-        
-        avg_score = sum(s.total_score for s in all_scores) / len(all_scores) if all_scores else 0
-        
-        return {
-            "total_submissions": total_submissions,
-            "completed": completed,
-            "processing": processing,
-            "errors": errors,
-            "total_documents": len([d for s in submissions for d in s.documents]),
-            "average_score": avg_score,
-            "high_score": max((s.total_score for s in all_scores), default=0),
-            "low_score": min((s.total_score for s in all_scores), default=0),
-        }
-    
+        """Generate a summary report of all submissions.
+
+        The backend computes the counters (SQL aggregates or a single
+        pass over its rows), so no Submission/Score objects are built.
+        """
+        return self.db_service.get_submission_stats()
+
     def generate_category_report(self) -> Dict[str, Dict]:
-        """Generate report by document category."""
-        submissions = self.db_service.list_submissions()
-        categories = {}
-        
-        for submission in submissions:
-            scores = self.db_service.get_submission_scores(submission.id)
-            for score in scores:
-                if score.category not in categories:
-                    categories[score.category] = {
-                        "count": 0,
-                        "total_score": 0,
-                        "avg_score": 0,
-                        "scores": []
-                    }
-                categories[score.category]["count"] += 1
-                categories[score.category]["total_score"] += score.total_score
-                categories[score.category]["scores"].append(score.total_score)
-        
-        for cat in categories:
-            if categories[cat]["count"] > 0:
-                categories[cat]["avg_score"] = categories[cat]["total_score"] / categories[cat]["count"]
-        
-        return categories
+        """Generate report by document category.
+
+        Delegates to the backend's GROUP BY (or single-pass) roll-up;
+        each entry carries count/total/avg/min/max for its category.
+        """
+        return self.db_service.get_category_stats()
     
     def get_top_applicants(self, limit: int = 10) -> List[Dict]:
-        """Get top scoring applicants."""
-        submissions = self.db_service.list_submissions()
-        
-        applicants = []
-        for submission in submissions:
-            scores = self.db_service.get_submission_scores(submission.id)
-            total_score = sum(s.total_score for s in scores)
-            
-            applicants.append({
-                "applicant_name": submission.applicant_name,
-                "applicant_email": submission.applicant_email,
-                "total_score": total_score,
-                "document_count": len(submission.documents),
-                "status": submission.status,
-            })
-        
-        # Sort by score descending
-        applicants.sort(key=lambda x: x["total_score"], reverse=True)
-        return applicants[:limit]
+        """Get top scoring applicants.
+
+        The backend selects the top rows (ORDER BY + LIMIT or a heap);
+        the non-top submissions are never materialized here.
+        """
+        return self.db_service.get_top_applicants(limit)
+
+    def generate_all(self, top_limit: int = 10) -> Dict:
+        """Build every report section for a single render.
+
+        Each section is one backend query (or one pass over the JSON
+        store), so a full render touches the store once per section
+        instead of re-fetching submissions and scores per caller.
+        """
+        return {
+            "summary": self.generate_summary_report(),
+            "categories": self.generate_category_report(),
+            "top_applicants": self.get_top_applicants(top_limit),
+        }
 
 
 def print_summary_report():
     """Print a summary report to console."""
     generator = ReportGenerator()
-    
+    report = generator.generate_all(top_limit=10)
+
     print("\n" + "=" * 80)
     print("SCHOLARSHIP SUBMISSION SUMMARY REPORT")
     print("=" * 80)
-    
-    summary = generator.generate_summary_report()
+
+    summary = report["summary"]
     print(f"\nTotal Submissions: {summary['total_submissions']}")
     print(f"  - Completed: {summary['completed']}")
     print(f"  - Processing: {summary['processing']}")
@@ -108,18 +78,18 @@ def print_summary_report():
     print("SCORES BY CATEGORY")
     print("-" * 80)
     
-    categories = generator.generate_category_report()
+    categories = report["categories"]
     for category, data in categories.items():
         print(f"\n{category.upper()}")
         print(f"  Count: {data['count']}")
         print(f"  Average Score: {data['avg_score']:.2f}")
-        print(f"  Min/Max: {min(data['scores']):.1f} / {max(data['scores']):.1f}")
+        print(f"  Min/Max: {data['min_score']:.1f} / {data['max_score']:.1f}")
     
     print("\n" + "-" * 80)
     print("TOP APPLICANTS")
     print("-" * 80)
     
-    top_applicants = generator.get_top_applicants(10)
+    top_applicants = report["top_applicants"]
     for i, applicant in enumerate(top_applicants, 1):
         print(f"{i}. {applicant['applicant_name']} ({applicant['applicant_email']})")
         print(f"   Score: {applicant['total_score']:.1f} | Documents: {applicant['document_count']} | Status: {applicant['status']}")
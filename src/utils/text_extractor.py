@@ -1,28 +1,140 @@
 """Extract text from various document formats."""
 import io
 import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional
 
+from src.config import settings
+
 logger = logging.getLogger(__name__)
 
+# PDF decoding is CPU-bound and holds the GIL, so the thread pools in
+# the workflow don't overlap it. A small shared process pool lets the
+# parse phase use real cores; downloads stay on the calling thread.
+# Creation is guarded by a lock because the workflow's document pool
+# can hit the first PDF on several threads at once.
+_PDF_POOL: Optional[ProcessPoolExecutor] = None
+_PDF_POOL_UNAVAILABLE = False
+_PDF_POOL_LOCK = threading.Lock()
+
+
+def _pdf_pool() -> Optional[ProcessPoolExecutor]:
+    """Lazily create the shared PDF parse pool, or None if we can't."""
+    global _PDF_POOL, _PDF_POOL_UNAVAILABLE
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None and not _PDF_POOL_UNAVAILABLE:
+            try:
+                _PDF_POOL = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+            except OSError as e:
+                logger.warning(f"Process pool unavailable, parsing PDFs in-process: {e}")
+                _PDF_POOL_UNAVAILABLE = True
+        return _PDF_POOL
+
+
+def parse_pdf_bytes(data: bytes, max_chars: int = 5000) -> str:
+    """
+    Parse PDF bytes into text, capped at max_chars characters.
+
+    Pure function of its inputs (parsers are imported inside), so it
+    can run in a worker process. Prefers pypdfium2, whose C-backed text
+    extraction is far faster than PyPDF2's, and falls back to PyPDF2
+    when pypdfium2 is missing or chokes on the file.
+    """
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        pdfium = None
+
+    if pdfium is not None:
+        try:
+            pdf = pdfium.PdfDocument(data)
+            try:
+                parts = []
+                length = 0
+                for i in range(len(pdf)):
+                    page = pdf[i]
+                    textpage = page.get_textpage()
+                    chunk = textpage.get_text_range() + "\n"
+                    # Release native page objects promptly
+                    textpage.close()
+                    page.close()
+                    parts.append(chunk)
+                    length += len(chunk)
+                    if length >= max_chars:
+                        break
+                return "".join(parts)[:max_chars]
+            finally:
+                pdf.close()
+        except Exception as e:
+            logger.warning(f"pypdfium2 could not parse PDF, trying PyPDF2: {e}")
+
+    import PyPDF2
+
+    pdf_reader = PyPDF2.PdfReader(io.BytesIO(data))
+
+    parts = []
+    length = 0
+    for page in pdf_reader.pages:
+        chunk = page.extract_text() + "\n"
+        parts.append(chunk)
+        length += len(chunk)
+        # Stop parsing pages once we have enough text
+        if length >= max_chars:
+            break
+
+    return "".join(parts)[:max_chars]
+
 
 class TextExtractor:
     """Extract text content from documents."""
-    
-    def extract_text(self, file_id: str, file_name: str, drive_service) -> str:
+
+    # Extracted text keyed by (file_id, revision) survives across runs
+    # on disk, so reruns skip the download and parse for unchanged files.
+    CACHE_DIR = os.path.join(".cache", "text")
+
+    def __init__(self, max_chars: Optional[int] = None):
+        """
+        Initialize the extractor with an in-process result cache.
+
+        Args:
+            max_chars: Cap on extracted text length; parsers stop
+                reading pages/paragraphs/rows once it is reached.
+                Defaults to settings.EXTRACT_MAX_CHARS.
+        """
+        self.max_chars = max_chars or settings.EXTRACT_MAX_CHARS
+        self._memory_cache = {}
+
+    def extract_text(self, file_id: str, file_name: str, drive_service, revision: Optional[str] = None) -> str:
         """
         Extract text from a document.
-        
+
         Args:
             file_id: Google Drive file ID.
             file_name: Name of the file.
             drive_service: Google Drive service instance.
-        
+            revision: Drive modifiedTime (or revision id). When given,
+                the result is cached and reused until the file changes.
+
         Returns:
             Extracted text content.
         """
+        if revision:
+            cached = self._cache_get(file_id, revision)
+            if cached is not None:
+                return cached
+
+        text = self._extract(file_id, file_name, drive_service)
+        # Failed extractions come back empty; don't pin those.
+        if revision and text:
+            self._cache_put(file_id, revision, text)
+        return text
+
+    def _extract(self, file_id: str, file_name: str, drive_service) -> str:
+        """Dispatch to the extractor for the file's format."""
         file_name_lower = file_name.lower()
-        
+
         try:
             if file_name_lower.endswith(".pdf"):
                 return self._extract_pdf(file_id, drive_service)
@@ -38,37 +150,73 @@ class TextExtractor:
         except Exception as e:
             logger.error(f"Error extracting text from {file_name}: {e}")
             raise
-    
+
+    def _cache_path(self, file_id: str, revision: str) -> str:
+        safe_revision = "".join(c if c.isalnum() else "-" for c in revision)
+        return os.path.join(self.CACHE_DIR, f"{file_id}_{safe_revision}.txt")
+
+    def _cache_get(self, file_id: str, revision: str) -> Optional[str]:
+        """Look up cached text in memory, then on disk."""
+        key = (file_id, revision)
+        if key in self._memory_cache:
+            return self._memory_cache[key]
+        path = self._cache_path(file_id, revision)
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    text = f.read()
+            except OSError:
+                return None
+            self._memory_cache[key] = text
+            return text
+        return None
+
+    def _cache_put(self, file_id: str, revision: str, text: str) -> None:
+        """Store extracted text in memory and on disk."""
+        self._memory_cache[(file_id, revision)] = text
+        try:
+            os.makedirs(self.CACHE_DIR, exist_ok=True)
+            with open(self._cache_path(file_id, revision), "w", encoding="utf-8") as f:
+                f.write(text)
+        except OSError as e:
+            logger.warning(f"Could not write text cache for {file_id}: {e}")
+
+    def _get_stream(self, file_id: str, drive_service):
+        """Fetch content as a seekable stream (no extra bytes copy)."""
+        if hasattr(drive_service, "get_file_stream"):
+            return drive_service.get_file_stream(file_id)
+        return io.BytesIO(drive_service.get_file_content(file_id))
+
     def _extract_pdf(self, file_id: str, drive_service) -> str:
-        """Extract text from PDF."""
+        """Extract text from PDF (download here, parse in the pool)."""
         try:
-            import PyPDF2
-            
-            file_content = drive_service.get_file_content(file_id)
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-            
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            
-            return text[:5000]  # Limit to first 5000 characters
+            data = self._get_stream(file_id, drive_service).read()
+
+            pool = _pdf_pool()
+            if pool is not None:
+                return pool.submit(parse_pdf_bytes, data, self.max_chars).result()
+            return parse_pdf_bytes(data, self.max_chars)
         except Exception as e:
-            logger.warning(f"Could not extract PDF with PyPDF2: {e}")
+            logger.warning(f"Could not extract PDF: {e}")
             return ""
-    
+
     def _extract_docx(self, file_id: str, drive_service) -> str:
         """Extract text from DOCX."""
         try:
             from docx import Document
-            
-            file_content = drive_service.get_file_content(file_id)
-            doc = Document(io.BytesIO(file_content))
-            
-            text = ""
+
+            doc = Document(self._get_stream(file_id, drive_service))
+
+            parts = []
+            length = 0
             for para in doc.paragraphs:
-                text += para.text + "\n"
-            
-            return text[:5000]  # Limit to first 5000 characters
+                parts.append(para.text)
+                parts.append("\n")
+                length += len(para.text) + 1
+                if length >= self.max_chars:
+                    break
+
+            return "".join(parts)[:self.max_chars]
         except Exception as e:
             logger.warning(f"Could not extract DOCX: {e}")
             return ""
@@ -77,7 +225,7 @@ class TextExtractor:
         """Extract text from plain text file."""
         try:
             file_content = drive_service.get_file_content(file_id)
-            return file_content.decode("utf-8", errors="ignore")[:5000]
+            return file_content.decode("utf-8", errors="ignore")[:self.max_chars]
         except Exception as e:
             logger.warning(f"Could not extract text: {e}")
             return ""
@@ -87,20 +235,37 @@ class TextExtractor:
         try:
             import openpyxl
             
-            file_content = drive_service.get_file_content(file_id)
-            wb = openpyxl.load_workbook(io.BytesIO(file_content))
-            
-            text = ""
-            for sheet in wb.sheetnames[:2]:  # Process first 2 sheets
-                ws = wb[sheet]
-                text += f"\n=== {sheet} ===\n"
-                for row in ws.iter_rows(max_rows=50, max_cols=10):
-                    for cell in row:
-                        if cell.value:
-                            text += str(cell.value) + " | "
-                    text += "\n"
-            
-            return text[:5000]
+            # read_only streams rows instead of building the full cell
+            # graph; values_only skips Cell object creation entirely.
+            wb = openpyxl.load_workbook(
+                self._get_stream(file_id, drive_service),
+                read_only=True,
+                data_only=True,
+            )
+            try:
+                parts = []
+                length = 0
+                for sheet in wb.sheetnames[:2]:  # Process first 2 sheets
+                    if length >= self.max_chars:
+                        break
+                    ws = wb[sheet]
+                    header = f"\n=== {sheet} ===\n"
+                    parts.append(header)
+                    length += len(header)
+                    for row in ws.iter_rows(max_rows=50, max_cols=10, values_only=True):
+                        for value in row:
+                            if value:
+                                chunk = str(value) + " | "
+                                parts.append(chunk)
+                                length += len(chunk)
+                        parts.append("\n")
+                        length += 1
+                        if length >= self.max_chars:
+                            break
+            finally:
+                wb.close()
+
+            return "".join(parts)[:self.max_chars]
         except Exception as e:
             logger.warning(f"Could not extract Excel: {e}")
             return ""
@@ -1,8 +1,10 @@
 """Main workflow for processing scholarship submissions."""
 import logging
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 
-from src.services import GoogleDriveService, DocumentClassifier, GradingAgent, DatabaseService
+from src.services import DocumentClassifier, GradingAgent, get_db_service, get_drive_service
 from src.models.schemas import Submission, Document, Score
 from src.utils.text_extractor import TextExtractor
 
@@ -11,13 +13,20 @@ logger = logging.getLogger(__name__)
 
 class SubmissionWorkflow:
     """Orchestrates the entire submission processing workflow."""
-    
-    def __init__(self):
-        """Initialize workflow with required services."""
-        self.drive_service = GoogleDriveService()
+
+    def __init__(self, drive_service=None, db_service=None):
+        """Initialize workflow with required services.
+
+        Args:
+            drive_service: Drive client to use. Defaults to the shared
+                instance (it holds credentials and an HTTP cache).
+            db_service: Database service to write to. Defaults to the
+                shared instance.
+        """
+        self.drive_service = drive_service or get_drive_service()
         self.classifier = DocumentClassifier()
         self.grading_agent = GradingAgent()
-        self.db_service = DatabaseService()
+        self.db_service = db_service or get_db_service()
         self.text_extractor = TextExtractor()
     
     def process_submissions(self, folder_id: Optional[str] = None) -> List[int]:
@@ -35,40 +44,54 @@ class SubmissionWorkflow:
             logger.info("Step 1: Fetching submissions from Google Drive...")
             submission_folders = self.drive_service.list_submissions(folder_id)
             
-            processed_ids = []
+            pending = []
             for folder in submission_folders:
                 folder_id = folder["id"]
                 folder_name = folder["name"]
-                
+
                 # Check if already processed
                 existing = self.db_service.get_submission_by_folder_id(folder_id)
                 if existing and existing.status in ["completed", "processing"]:
                     logger.info(f"Submission {folder_name} already processed")
                     continue
-                
-                # Process this submission
-                try:
-                    submission_id = self._process_single_submission(
-                        folder_id,
-                        folder_name,
-                        existing
-                    )
-                    processed_ids.append(submission_id)
-                except Exception as e:
-                    logger.error(f"Error processing submission {folder_name}: {e}")
-                    if existing:
-                        self.db_service.update_submission_status(
-                            existing.id,
-                            "error",
-                            str(e)
-                        )
-            
+                pending.append((folder_id, folder_name, existing))
+
+            # Folders are independent, so overlap their Drive and
+            # grading waits across a small pool too.
+            if len(pending) > 1:
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    results = list(executor.map(
+                        lambda args: self._process_single_submission_safe(*args),
+                        pending,
+                    ))
+            else:
+                results = [self._process_single_submission_safe(*args) for args in pending]
+
+            processed_ids = [sid for sid in results if sid is not None]
             logger.info(f"Processed {len(processed_ids)} submissions")
             return processed_ids
-        
+
         except Exception as e:
             logger.error(f"Error in workflow: {e}")
             raise
+
+    def _process_single_submission_safe(self, folder_id: str, folder_name: str, existing: Optional[Submission]) -> Optional[int]:
+        """Process one folder, converting failures into an error status.
+
+        Mirrors the old per-folder try/except so one bad submission
+        never aborts the batch (or, now, its worker).
+        """
+        try:
+            return self._process_single_submission(folder_id, folder_name, existing)
+        except Exception as e:
+            logger.error(f"Error processing submission {folder_name}: {e}")
+            if existing:
+                self.db_service.update_submission_status(
+                    existing.id,
+                    "error",
+                    str(e)
+                )
+            return None
     
     def _process_single_submission(self, folder_id: str, folder_name: str, existing: Optional[Submission]) -> int:
         """
@@ -104,45 +127,107 @@ class SubmissionWorkflow:
         # Step 2: List all documents in submission
         logger.info("Step 2: Fetching documents...")
         documents = self.drive_service.list_documents(folder_id)
-        
-        for doc in documents:
-            self._process_document(submission_id, doc)
+
+        if len(documents) > 1:
+            # Each document is independent and I/O-bound (Drive download
+            # plus classification), so fan out across a bounded pool.
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                prepared = list(executor.map(
+                    lambda doc: self._prepare_document(submission_id, doc),
+                    documents,
+                ))
+        else:
+            prepared = [self._prepare_document(submission_id, doc) for doc in documents]
+        prepared = [p for p in prepared if p is not None]
+
+        # Step 4: Grade through the shared pool, which throttles the
+        # in-flight OpenAI calls and retries rate limits with backoff.
+        logger.info("Step 4: Grading documents...")
+        gradable = [
+            (index, doc, content)
+            for index, (doc, content) in enumerate(prepared)
+            if doc.category != "other" and content
+        ]
+        gradings = self.grading_agent.grade_many([
+            {"category": doc.category, "content": content, "file_name": doc.name}
+            for _, doc, content in gradable
+        ])
+        grading_by_index = {
+            index: grading for (index, _, _), grading in zip(gradable, gradings)
+        }
+
+        # Step 5: Persist in two bulk writes instead of one commit per row
+        logger.info("Step 5: Saving documents and scores...")
+        document_ids = self.db_service.bulk_create_documents(
+            submission_id, [doc for doc, _ in prepared]
+        )
+        scores = [
+            Score(
+                document_id=document_id,
+                category=doc.category,
+                total_score=grading["total_score"],
+                max_score=grading["max_score"],
+                criteria_scores=grading.get("criteria_scores", {}),
+                feedback=grading.get("feedback", ""),
+            )
+            for index, (document_id, (doc, _)) in enumerate(zip(document_ids, prepared))
+            for grading in [grading_by_index.get(index)]
+            if grading
+        ]
+        if scores:
+            self.db_service.bulk_create_scores(submission_id, scores)
         
         # Mark submission as completed
         self.db_service.update_submission_status(submission_id, "completed")
+        # Checkpoint the JSON-backed store once per submission rather
+        # than once per write (no-op for backends without flush()).
+        if hasattr(self.db_service, "flush"):
+            self.db_service.flush()
         logger.info(f"Submission {submission_id} completed")
         
         return submission_id
     
-    def _process_document(self, submission_id: int, doc_metadata: dict) -> None:
+    def _prepare_document(self, submission_id: int, doc_metadata: dict) -> Optional[tuple]:
         """
-        Process a single document: classify and grade it.
-        
+        Download, extract, and classify one document without touching
+        the store.
+
+        Grading and writes are batched by the caller, so this only does
+        the Drive and classification work.
+
         Args:
             submission_id: ID of the parent submission.
             doc_metadata: File metadata from Google Drive.
+
+        Returns:
+            Tuple of (Document, extracted content), or None when the
+            document could not be processed.
         """
         doc_id = doc_metadata["id"]
         doc_name = doc_metadata["name"]
         mime_type = doc_metadata.get("mimeType", "")
         doc_size = doc_metadata.get("size", 0)
-        
+
         logger.info(f"Processing document: {doc_name}")
-        
+
         try:
             # Step 3: Classify document
             logger.info("Step 3: Classifying document...")
-            
+
             # Download and extract text for better classification
             try:
-                content = self.text_extractor.extract_text(doc_id, doc_name, self.drive_service)
+                content = self.text_extractor.extract_text(
+                    doc_id,
+                    doc_name,
+                    self.drive_service,
+                    revision=doc_metadata.get("modifiedTime"),
+                )
             except Exception as e:
                 logger.warning(f"Could not extract text from {doc_name}: {e}")
                 content = ""
-            
+
             category = self.classifier.classify(doc_name, mime_type, content)
-            
-            # Create document record
+
             document = Document(
                 name=doc_name,
                 google_drive_id=doc_id,
@@ -150,37 +235,15 @@ class SubmissionWorkflow:
                 category=category,
                 submission_id=submission_id,
                 file_size=doc_size,
+                processed=True,
             )
-            document_id = self.db_service.create_document(submission_id, document)
-            
-            # Step 4: Grade document
-            logger.info("Step 4: Grading document...")
-            if category != "other" and content:
-                grading_result = self.grading_agent.grade_document(
-                    category,
-                    content,
-                    doc_name
-                )
-                
-                # Save score
-                score = Score(
-                    document_id=document_id,
-                    category=category,
-                    total_score=grading_result["total_score"],
-                    max_score=grading_result["max_score"],
-                    criteria_scores=grading_result.get("criteria_scores", {}),
-                    feedback=grading_result.get("feedback", ""),
-                )
-                self.db_service.create_score(submission_id, score)
-                
-                logger.info(f"Graded {doc_name}: {grading_result['total_score']}/{grading_result['max_score']}")
-            
-            # Mark document as processed
-            self.db_service.update_document(document_id, processed=True)
-        
+
+            return document, content
+
         except Exception as e:
             logger.error(f"Error processing document {doc_name}: {e}")
             # Log the error but continue processing other documents
+            return None
     
     def get_submission_summary(self, submission_id: int) -> dict:
         """
@@ -197,7 +260,13 @@ class SubmissionWorkflow:
             return {}
         
         scores = self.db_service.get_submission_scores(submission_id)
-        
+
+        # Bucket scores by document once instead of rescanning the
+        # score list for every document.
+        scores_by_doc = defaultdict(list)
+        for score in scores:
+            scores_by_doc[score.document_id].append(score)
+
         summary = {
             "submission_id": submission.id,
             "applicant_name": submission.applicant_name,
@@ -209,7 +278,7 @@ class SubmissionWorkflow:
                     "name": doc.name,
                     "category": doc.category,
                     "processed": doc.processed,
-                    "scores": [s for s in scores if s.document_id == doc.id],
+                    "scores": scores_by_doc.get(doc.id, []),
                 }
                 for doc in submission.documents
             ],
@@ -0,0 +1,272 @@
+"""Tests for the database backends and the classification cache."""
+import atexit
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.config import settings
+from src.models.schemas import Submission, Document, Score
+from src.services.document_classifier import DocumentClassifier
+from src.services.simple_database_service import DatabaseService as SimpleStore
+
+
+def _submission(n: int = 1) -> Submission:
+    return Submission(
+        applicant_name=f"Applicant {n}",
+        applicant_email=f"applicant{n}@example.com",
+        submission_folder_id=f"folder-{n}",
+        status="completed",
+    )
+
+
+class SimpleStoreTestCase(unittest.TestCase):
+    """Fixture pointing the JSON store at a temporary directory."""
+
+    def setUp(self):
+        """Redirect the store files into a fresh temp directory."""
+        self._dir = tempfile.mkdtemp()
+        self._paths = (SimpleStore.FILE_PATH, SimpleStore.LOG_PATH)
+        SimpleStore.FILE_PATH = os.path.join(self._dir, "store.json")
+        SimpleStore.LOG_PATH = SimpleStore.FILE_PATH + ".log"
+
+    def tearDown(self):
+        """Restore the store paths and drop the temp directory."""
+        SimpleStore.FILE_PATH, SimpleStore.LOG_PATH = self._paths
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def make_store(self) -> SimpleStore:
+        """Create a store whose atexit flush won't outlive the temp dir."""
+        store = SimpleStore()
+        self.addCleanup(atexit.unregister, store.flush)
+        return store
+
+
+class TestWriteAheadLog(SimpleStoreTestCase):
+    """Test write-ahead log replay and compaction."""
+
+    def test_log_replayed_on_load(self):
+        """Unflushed writes survive a restart via log replay."""
+        store = self.make_store()
+        sid = store.create_submission(_submission())
+        self.assertTrue(os.path.exists(SimpleStore.LOG_PATH))
+
+        reloaded = self.make_store()
+        submission = reloaded.get_submission(sid)
+        self.assertIsNotNone(submission)
+        self.assertEqual(submission.applicant_name, "Applicant 1")
+        # Replay must also advance the ID counter past logged records.
+        self.assertEqual(reloaded.next_submission_id, sid + 1)
+
+    def test_torn_final_write_is_ignored(self):
+        """A partial last log line (crash mid-write) is skipped."""
+        store = self.make_store()
+        sid = store.create_submission(_submission())
+        with open(SimpleStore.LOG_PATH, "a", encoding="utf-8") as f:
+            f.write('{"op": "create_submission", "data": {"id"')
+
+        reloaded = self.make_store()
+        self.assertIsNotNone(reloaded.get_submission(sid))
+        self.assertEqual(len(reloaded.submissions), 1)
+
+    def test_compaction_folds_log_into_snapshot(self):
+        """flush() truncates the log and the snapshot keeps the data."""
+        store = self.make_store()
+        sid = store.create_submission(_submission())
+        store.flush()
+        self.assertFalse(os.path.exists(SimpleStore.LOG_PATH))
+
+        reloaded = self.make_store()
+        self.assertIsNotNone(reloaded.get_submission(sid))
+
+
+class TestBulkCreatePairing(SimpleStoreTestCase):
+    """Test that bulk-create IDs pair with their inputs, in order."""
+
+    def _documents(self, submission_id: int) -> list:
+        return [
+            Document(
+                name=f"doc{i}.pdf",
+                google_drive_id=f"gd-{i}",
+                mime_type="application/pdf",
+                category="essay",
+                submission_id=submission_id,
+            )
+            for i in range(5)
+        ]
+
+    def test_document_ids_match_input_order(self):
+        store = self.make_store()
+        sid = store.create_submission(_submission())
+        documents = self._documents(sid)
+
+        ids = store.bulk_create_documents(sid, documents)
+
+        self.assertEqual(len(ids), len(documents))
+        for document_id, document in zip(ids, documents):
+            self.assertEqual(store.get_document(document_id).name, document.name)
+
+    def test_score_ids_match_input_order(self):
+        store = self.make_store()
+        sid = store.create_submission(_submission())
+        document_ids = store.bulk_create_documents(sid, self._documents(sid))
+        scores = [
+            Score(
+                document_id=document_id,
+                category="essay",
+                total_score=float(10 * i),
+                max_score=100.0,
+                criteria_scores={},
+                feedback=f"score {i}",
+            )
+            for i, document_id in enumerate(document_ids)
+        ]
+
+        score_ids = store.bulk_create_scores(sid, scores)
+
+        self.assertEqual(len(score_ids), len(scores))
+        by_doc = {s.document_id: s for s in store.get_submission_scores(sid)}
+        for document_id, score in zip(document_ids, scores):
+            self.assertEqual(by_doc[document_id].total_score, score.total_score)
+
+
+class TestSqlBulkCreatePairing(unittest.TestCase):
+    """Same pairing guarantee on the SQLAlchemy backend."""
+
+    def setUp(self):
+        """Point the cached engine at a throwaway sqlite database."""
+        from src.services import database_service
+
+        self._dir = tempfile.mkdtemp()
+        settings.__dict__["DATABASE_URL"] = (
+            "sqlite:///" + os.path.join(self._dir, "test.db")
+        )
+        database_service._get_engine.cache_clear()
+        database_service._get_sessionmaker.cache_clear()
+        self.db = database_service.DatabaseService()
+
+    def tearDown(self):
+        """Drop the engine cache and the temp database."""
+        from src.services import database_service
+
+        self.db.engine.dispose()
+        database_service._get_sessionmaker.cache_clear()
+        database_service._get_engine.cache_clear()
+        settings.__dict__.pop("DATABASE_URL", None)
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def test_document_ids_match_input_order(self):
+        sid = self.db.create_submission(_submission())
+        documents = [
+            Document(
+                name=f"doc{i}.pdf",
+                google_drive_id=f"gd-{i}",
+                mime_type="application/pdf",
+                category="essay",
+                submission_id=sid,
+            )
+            for i in range(5)
+        ]
+
+        ids = self.db.bulk_create_documents(sid, documents)
+
+        self.assertEqual(len(ids), len(documents))
+        for document_id, document in zip(ids, documents):
+            self.assertEqual(self.db.get_document(document_id).name, document.name)
+
+
+class TestSqliteStore(unittest.TestCase):
+    """Tests for the stdlib-sqlite3 backend."""
+
+    def setUp(self):
+        """Point the sqlite store at a throwaway database file."""
+        from src.services.sqlite_database_service import DatabaseService as SqliteStore
+
+        self._dir = tempfile.mkdtemp()
+        self._orig_path = SqliteStore.FILE_PATH
+        SqliteStore.FILE_PATH = os.path.join(self._dir, "store.db")
+        self.store = SqliteStore()
+
+    def tearDown(self):
+        """Close the connection and drop the temp database."""
+        from src.services.sqlite_database_service import DatabaseService as SqliteStore
+
+        self.store.close()
+        SqliteStore.FILE_PATH = self._orig_path
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def test_submission_roundtrip(self):
+        sid = self.store.create_submission(_submission())
+        submission = self.store.get_submission(sid)
+        self.assertEqual(submission.applicant_name, "Applicant 1")
+        self.assertEqual(
+            self.store.get_submission_by_folder_id("folder-1").id, sid
+        )
+
+    def test_bulk_create_ids_match_input_order(self):
+        sid = self.store.create_submission(_submission())
+        documents = [
+            Document(
+                name=f"doc{i}.pdf",
+                google_drive_id=f"gd-{i}",
+                mime_type="application/pdf",
+                category="essay",
+                submission_id=sid,
+            )
+            for i in range(5)
+        ]
+
+        ids = self.store.bulk_create_documents(sid, documents)
+
+        self.assertEqual(len(ids), len(documents))
+        for document_id, document in zip(ids, documents):
+            self.assertEqual(self.store.get_document(document_id).name, document.name)
+
+    def test_concurrent_creates_allocate_unique_ids(self):
+        """Worker threads sharing the store must not collide on writes."""
+        import threading
+
+        ids = []
+        def worker(n):
+            for i in range(25):
+                ids.append(self.store.create_submission(_submission(n * 100 + i)))
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(set(ids)), 100)
+
+
+class TestClassificationCache(unittest.TestCase):
+    """Test the classifier's rule-result cache keying."""
+
+    def test_divergent_documents_do_not_share_cache_entry(self):
+        """Contents sharing a long prefix must not collide in the cache."""
+        classifier = DocumentClassifier()
+        # Longer than the old 2048-char digest window, shorter than the
+        # 4096-char scan window, and free of category keywords.
+        prefix = "lorem ipsum " * 200
+
+        first = classifier.classify(
+            "document.bin", content=prefix + "official transcript with gpa"
+        )
+        second = classifier.classify(
+            "document.bin", content=prefix + "this essay is my personal statement"
+        )
+
+        self.assertEqual(first, "transcript")
+        self.assertEqual(second, "essay")
+
+    def test_repeat_classification_hits_cache(self):
+        """The same inputs are answered from the cache."""
+        classifier = DocumentClassifier()
+        classifier.classify("essay.pdf", content="my essay")
+        self.assertEqual(len(classifier._rule_cache), 1)
+        classifier.classify("essay.pdf", content="my essay")
+        self.assertEqual(len(classifier._rule_cache), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()